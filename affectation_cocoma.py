@@ -0,0 +1,65 @@
+import numpy as np
+
+# -------------------------------
+# Affectation optimale (méthode hongroise)
+# -------------------------------
+def hungarian(cost):
+    """Affectation de coût minimal pour une matrice de coûts rectangulaire, en O(n²·m).
+
+    Chaque ligne (ou chaque colonne s'il y a plus de lignes que de colonnes) reçoit exactement un élément de
+    l'autre dimension. Renvoie (lignes, colonnes) : la ligne lignes[i] est affectée à la colonne colonnes[i].
+    Version par chemins augmentants les plus courts avec potentiels, la boucle interne étant vectorisée.
+    """
+    cost = np.asarray(cost, dtype=float)
+    transpose = cost.shape[0] > cost.shape[1]
+    if transpose:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # Indices décalés de 1 : la colonne 0 est une colonne fictive
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)    # p[j] : ligne affectée à la colonne j (0 si libre)
+    way = np.zeros(m + 1, dtype=np.int64)  # Colonne précédente sur le chemin augmentant
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+
+        # Inverser le chemin augmentant
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    columns = np.flatnonzero(p[1:])
+    rows = p[1:][columns] - 1
+    order = np.argsort(rows)
+    rows, columns = rows[order], columns[order]
+    if transpose:
+        order = np.argsort(columns)
+        return columns[order], rows[order]
+    return rows, columns
@@ -0,0 +1,225 @@
+"""Benchmarks des heuristiques d'enchère, des méthodes d'allocation et des méthodes d'ordonnancement, sur des
+scénarios reproductibles (graine fixe) à plusieurs échelles.
+
+    pytest benchmarks/bench_cocoma.py --benchmark-json=results/bench.json   # avec pytest-benchmark
+    python benchmarks/bench_cocoma.py --output results/bench.json           # sans dépendance
+    python benchmarks/bench_cocoma.py --compare ancien.json nouveau.json    # comparaison entre deux commits
+
+Les combinaisons les plus coûteuses (SSI, regret et méthode hongroise sur 10 000 tâches) ne sont lancées qu'avec
+COCOMA_BENCH_FULL=1.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modele_cocoma import Environment, Task  # noqa: E402
+
+TAXIS = (3, 30, 300)
+TASKS = (3, 100, 10000)
+ROUTES = (3, 10, 100, 10000)  # Nombre de tâches d'une tournée à ordonnancer
+GRID_SIZE = 100
+SEED = 0
+PROBES = 100  # Tâches sur lesquelles chaque heuristique enchérit
+FULL = os.environ.get("COCOMA_BENCH_FULL") == "1"
+
+# Nombre maximal de tâches par méthode, (par défaut, avec COCOMA_BENCH_FULL=1) ; None : pas de limite
+ALLOCATORS = {
+    "allocate_tasks_random": (None, None),
+    "allocate_tasks_opti": (3, 3),  # Held-Karp sur le plan complet de chaque taxi
+    "allocate_tasks_psi": (None, None),
+    "allocate_tasks_ssi": (100, None),
+    "allocate_tasks_ssi_with_regret": (100, None),
+    "allocate_tasks_hungarian": (100, None),
+}
+ORDERINGS = {
+    "greedy_task_order": (None, None),
+    "optimize_task_order": (10, 10),  # Held-Karp, O(2^n·n²)
+    "optimize_task_order_bnb": (10, 10),
+    "optimize_task_order_christofides": (100, 100),  # Matrices n × n
+    "improve_task_order": (100, 100),
+}
+HEURISTICS = ("prim_heuristic", "insert_task_heuristic")
+
+
+def _within(limits, size):
+    limit = limits[1] if FULL else limits[0]
+    return limit is None or size <= limit
+
+
+# -------------------------------
+# Scénarios
+# -------------------------------
+def scenario(num_taxis, num_tasks, seed=SEED):
+    """Environnement reproductible avec num_tasks tâches en attente (toutes enregistrées dans la matrice)."""
+    env = Environment(grid_size=GRID_SIZE, num_taxis=num_taxis, task_frequency=1, task_number=num_tasks,
+                      num_iterations=1, random_seed=seed, metrics=False)
+    env.tasks = [Task(start=env.random_position(), end=env.random_position()) for _ in range(num_tasks)]
+    env.distances.add_tasks(env.tasks)
+    return env
+
+
+class Case:
+    """Un benchmark : setup() construit le scénario et renvoie la fonction à chronométrer.
+
+    Si mutates est vrai, la fonction modifie le scénario et setup() doit être rappelé avant chaque mesure.
+    """
+
+    def __init__(self, group, name, params, setup, mutates=False):
+        self.group = group
+        self.name = name
+        self.params = params
+        self.setup = setup
+        self.mutates = mutates
+        self.id = f"{group}-{name}-" + "-".join(f"{key}{value}" for key, value in params.items())
+
+
+def _heuristic_case(name, num_taxis, num_tasks):
+    def setup():
+        env = scenario(num_taxis, num_tasks)
+        # Plans déjà chargés : les tâches en attente sont réparties entre les taxis
+        for i, task in enumerate(env.tasks):
+            env.taxis[i % num_taxis].tasks.append(task)
+        probes = [Task(start=env.random_position(), end=env.random_position()) for _ in range(PROBES)]
+        env.distances.add_tasks(probes)
+        heuristic = getattr(env.taxis[0], name)
+        return lambda: [heuristic(task) for task in probes]
+    return Case("heuristic", name, {"taxis": num_taxis, "tasks": num_tasks}, setup)
+
+
+def _allocation_case(name, num_taxis, num_tasks):
+    def setup():
+        env = scenario(num_taxis, num_tasks)
+        return getattr(env, name)
+    return Case("allocation", name, {"taxis": num_taxis, "tasks": num_tasks}, setup, mutates=True)
+
+
+def _ordering_case(name, route_size):
+    def setup():
+        env = scenario(1, route_size)
+        tasks, position = list(env.tasks), env.taxis[0].position
+        order = getattr(env, name)
+        return lambda: order(tasks, position)
+    return Case("ordering", name, {"tasks": route_size}, setup)
+
+
+def cases():
+    result = []
+    for num_taxis in TAXIS:
+        for num_tasks in TASKS:
+            result += [_heuristic_case(name, num_taxis, num_tasks) for name in HEURISTICS]
+            result += [_allocation_case(name, num_taxis, num_tasks)
+                       for name, limits in ALLOCATORS.items() if _within(limits, num_tasks)]
+    for route_size in ROUTES:
+        result += [_ordering_case(name, route_size) for name, limits in ORDERINGS.items() if _within(limits, route_size)]
+    return result
+
+
+CASES = cases()
+
+
+# -------------------------------
+# pytest-benchmark
+# -------------------------------
+if "pytest" in sys.modules:
+    # Sous pytest, le module est ignoré si pytest-benchmark n'est pas installé
+    import pytest
+
+    pytest.importorskip("pytest_benchmark")
+
+    @pytest.mark.parametrize("case", CASES, ids=[case.id for case in CASES])
+    def test_benchmark(benchmark, case):
+        benchmark.group = f"{case.group}-{case.name}"
+        benchmark.extra_info.update(case.params)
+        if case.mutates:
+            benchmark.pedantic(lambda run: run(), setup=lambda: ((case.setup(),), {}), rounds=5)
+        else:
+            benchmark(case.setup())
+
+
+# -------------------------------
+# Exécution sans pytest-benchmark
+# -------------------------------
+def measure(case, min_time=0.2, min_rounds=3, max_rounds=50):
+    """Durées (s) de plusieurs exécutions : au moins min_rounds, jusqu'à min_time secondes cumulées."""
+    times = []
+    run = None
+    while len(times) < max_rounds and (len(times) < min_rounds or sum(times) < min_time):
+        if run is None or case.mutates:
+            run = case.setup()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def git_commit():
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def run_all(selected=None):
+    benchmarks = []
+    for case in CASES:
+        if selected and not any(pattern in case.id for pattern in selected):
+            continue
+        times = measure(case)
+        benchmarks.append({
+            "id": case.id, "group": case.group, "name": case.name, "params": case.params, "rounds": len(times),
+            "min": min(times), "median": statistics.median(times), "mean": statistics.fmean(times), "max": max(times),
+        })
+        print(f"{case.id:<60} {statistics.median(times) * 1000:10.3f} ms")
+    return {
+        "commit": git_commit(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "full": FULL,
+        "benchmarks": benchmarks,
+    }
+
+
+def load_results(path):
+    """Médianes par benchmark d'un fichier JSON de ce script ou de pytest-benchmark (--benchmark-json)."""
+    with open(path) as f:
+        data = json.load(f)
+    medians = {}
+    for bench in data["benchmarks"]:
+        if "stats" in bench:
+            # Format pytest-benchmark : test_benchmark[<id>]
+            name = bench["name"]
+            medians[name[name.find("[") + 1:name.rfind("]")] if "[" in name else name] = bench["stats"]["median"]
+        else:
+            medians[bench["id"]] = bench["median"]
+    return medians
+
+
+def compare(old_path, new_path):
+    old, new = load_results(old_path), load_results(new_path)
+    print(f"{'benchmark':<60} {'avant (ms)':>12} {'après (ms)':>12} {'rapport':>9}")
+    for case_id in sorted(old.keys() & new.keys()):
+        ratio = new[case_id] / old[case_id] if old[case_id] else float("inf")
+        print(f"{case_id:<60} {old[case_id] * 1000:12.3f} {new[case_id] * 1000:12.3f} {ratio:9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    parser.add_argument("--select", nargs="+", help="ne lancer que les benchmarks dont l'identifiant contient un motif")
+    parser.add_argument("--compare", nargs=2, metavar=("ANCIEN", "NOUVEAU"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+    else:
+        results = run_all(args.select)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=1)
@@ -0,0 +1,79 @@
+"""Temps d'import à froid des modules du projet, mesuré dans des processus Python neufs.
+
+    python benchmarks/import_time.py                      # arbre de travail
+    python benchmarks/import_time.py --baseline HEAD~1    # comparaison avec une révision git
+"""
+import argparse
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+MODULES = ["modele_cocoma", "partie1_cocoma", "partie2_cocoma", "partie3_cocoma", "visualisation_cocoma"]
+HEAVY = ["pygame", "networkx"]
+
+SNIPPET = """
+import sys, time
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+print()
+print(elapsed, *[name in sys.modules for name in {heavy!r}])
+"""
+
+
+def measure(root, module, repeat):
+    """Médiane du temps d'import (s) et modules lourds chargés, ou None si le module n'existe pas dans root."""
+    if not os.path.exists(os.path.join(root, module + ".py")):
+        return None
+    times = []
+    loaded = None
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as cwd:  # Certains scripts écrivent des fichiers à l'import
+            result = subprocess.run(
+                [sys.executable, "-c", SNIPPET.format(module=module, heavy=HEAVY)],
+                cwd=cwd, env=dict(os.environ, PYTHONPATH=root, PYTHONDONTWRITEBYTECODE="1"),
+                capture_output=True, text=True,
+            )
+        if result.returncode != 0:
+            return None
+        fields = result.stdout.strip().splitlines()[-1].split()
+        times.append(float(fields[0]))
+        loaded = [name for name, flag in zip(HEAVY, fields[1:]) if flag == "True"]
+    return statistics.median(times), loaded
+
+
+def export_revision(revision, destination):
+    """Extraire une révision git du dépôt dans destination."""
+    archive = subprocess.run(["git", "archive", revision], cwd=ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(destination)
+
+
+def report(label, root, repeat):
+    print(f"\n{label}")
+    for module in MODULES:
+        result = measure(root, module, repeat)
+        if result is None:
+            print(f"  {module:<22} absent")
+            continue
+        elapsed, loaded = result
+        print(f"  {module:<22} {elapsed * 1000:8.1f} ms   {', '.join(loaded) or '-'}")
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", help="révision git à mesurer en comparaison")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as baseline_root:
+            export_revision(args.baseline, baseline_root)
+            report(f"Révision {args.baseline}", baseline_root, args.repeat)
+    report("Arbre de travail", ROOT, args.repeat)
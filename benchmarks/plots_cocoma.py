@@ -0,0 +1,100 @@
+"""Régénérer les figures results/Comparaison_*.png (coût de l'allocation et temps d'exécution) à partir du fichier
+de résultats SQLite de resultats_cocoma : balayages reproductibles du tournoi et résultats pydcop importés.
+
+    python benchmarks/plots_cocoma.py --seeds 20        # simuler les balayages, les enregistrer, puis tracer
+    python benchmarks/plots_cocoma.py                   # tracer seulement, à partir des résultats enregistrés
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from resultats_cocoma import ResultStore, aggregate, tournament_rows  # noqa: E402
+from tournoi_cocoma import make_cells, run_tournament  # noqa: E402
+
+# Balayages : (suffixe des figures, paramètre affiché, libellé de l'axe, cellules de l'environnement)
+SWEEPS = {
+    "par_grille": ("grid_size", "La taille de la grille", {"grid_size": [10, 20, 30, 40, 50]}),
+    "par_nb_taxi": ("num_taxis", "Le nombre de taxis", {"num_taxis": [3, 6, 9, 12, 15]}),
+    # 3 taxis par défaut : 1 à 5 tâches par taxi
+    "nb_tache_par_taxi": ("task_number", "Le nombre de tâches", {"task_number": [3, 6, 9, 12, 15]}),
+}
+
+
+def run_sweeps(store, seeds, allocation_methods=(0, 2, 3, 4), ordonancement_method=2, max_workers=None):
+    """Simuler chaque balayage sur les graines 0 .. seeds-1 et ajouter les lignes au fichier de résultats
+    (run = sweep_<balayage>)."""
+    for name, (_, _, parameters) in SWEEPS.items():
+        cells = make_cells(range(seeds), allocation_methods, (ordonancement_method,), **parameters)
+        store.append(tournament_rows(run_tournament(cells, max_workers=max_workers), run=f"sweep_{name}"))
+
+
+def _plot(plt, result, parameter, column, xlabel, ylabel, title, path, log=False):
+    plt.figure(figsize=(10, 5))
+    for method in np.unique(result["method"]):
+        selected = result["method"] == method
+        order = np.argsort(result[parameter][selected])
+        plt.plot(result[parameter][selected][order], result[column][selected][order], marker='o', label=method)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    plt.title(title)
+    if log:
+        plt.yscale('log')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(path)
+    plt.close()
+
+
+def plot_results(store, output_dir):
+    """Tracer le coût moyen et le temps moyen par méthode : pour chaque balayage enregistré, puis pour les
+    résultats pydcop en fonction du nombre de tâches."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    os.makedirs(output_dir, exist_ok=True)
+    for name, (parameter, label, _) in SWEEPS.items():
+        result = aggregate(store.columns("run = ?", (f"sweep_{name}",)), ("method", parameter))
+        if not len(result["count"]):
+            continue
+        around = f"{label[0].lower()}{label[1:]}"
+        _plot(plt, result, parameter, "cost_mean", label, "Cout", f"Le cout de l'allocation au sein de {around}",
+              os.path.join(output_dir, f"Comparaison_cost_alloc_{name}.png"))
+        _plot(plt, result, parameter, "time_mean", label, "Temps de l'exécution (secondes)",
+              f"Le temps de l'exécution au sein de {around}",
+              os.path.join(output_dir, f"Comparaison_time_exec_{name}.png"), log=True)
+
+    result = aggregate(store.columns("source = 'pydcop'"), ("method", "task_number"))
+    if len(result["count"]):
+        _plot(plt, result, "task_number", "cost_mean", "Le nombre de tache", "Cout",
+              "Le cout de l'allocation au sein du nombre du tache pour méthode de pydcop",
+              os.path.join(output_dir, "Comparaison_cost_alloc_par_pydcop.png"))
+        _plot(plt, result, "task_number", "time_mean", "Le nombre de tache", "Temps de l'exécution",
+              "Le temps de l'éxecution de l'allocation au sein du nombre du tache pour méthode de pydcop",
+              os.path.join(output_dir, "Comparaison_temps_alloc_par_pydcop.png"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--store", default=os.path.join(ROOT, "results", "resultats.sqlite"),
+                        help="fichier SQLite des résultats (défaut : %(default)s)")
+    parser.add_argument("--seeds", type=int, default=None, help="simuler les balayages sur autant de graines")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output-dir", default=os.path.join(ROOT, "results"))
+    args = parser.parse_args()
+
+    store = ResultStore(args.store)
+    if args.seeds:
+        start = time.perf_counter()
+        run_sweeps(store, args.seeds, max_workers=args.workers)
+        print(f"Balayages simulés en {time.perf_counter() - start:.2f} s")
+    start = time.perf_counter()
+    plot_results(store, args.output_dir)
+    print(f"Figures tracées en {time.perf_counter() - start:.2f} s ({len(store)} lignes)")
+    store.close()
@@ -0,0 +1,243 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+# Taille maximale du message UTIL de DPOP (num_taxis ** num_tasks entrées)
+DPOP_MAX_ENTRIES = 2 ** 24
+
+# -------------------------------
+# Modèle DCOP de l'allocation
+# -------------------------------
+class ProblemeDCOP:
+    """Le DCOP écrit par generate_file_yaml, sous forme de tables NumPy :
+
+    - pref_i : la tâche i coûte k + 1 si elle est confiée au taxi k ;
+    - different_i_j (i < j) : distance fin de i -> début de j si les deux tâches sont confiées au même taxi ;
+    - cout_taxi_k : coût propre + approche depuis le taxi k de la première tâche i < n - 1 qui lui est confiée,
+      et à défaut celui de la dernière tâche (même enchaînement de « if ... else » que dans le fichier YAML).
+
+    Une affectation est un tableau d'indices de taxis, un par tâche ; cost() accepte aussi un lot d'affectations.
+    """
+
+    def __init__(self, preferences, paires, couts_taxi):
+        self.preferences = preferences  # preferences[k] : coût de pref_i pour le taxi k
+        self.paires = paires  # paires[i, j] (i < j, 0 ailleurs) : coût de different_i_j
+        self.couts_taxi = couts_taxi  # couts_taxi[k, i] : coût de la tâche i dans cout_taxi_k
+        self.num_taxis, self.num_tasks = couts_taxi.shape
+
+    @classmethod
+    def from_environment(cls, env, tasks=None):
+        """Construire le DCOP des tâches (en attente par défaut) et des taxis de l'environnement."""
+        tasks = env.tasks if tasks is None else tasks
+        starts = np.array([task.start for task in tasks], dtype=float).reshape(-1, 2)
+        ends = np.array([task.end for task in tasks], dtype=float).reshape(-1, 2)
+        costs = np.array([task.cost for task in tasks], dtype=float)
+        positions = np.array([taxi.position for taxi in env.taxis], dtype=float).reshape(-1, 2)
+
+        paires = np.triu(np.hypot(ends[:, None, 0] - starts[None, :, 0], ends[:, None, 1] - starts[None, :, 1]), k=1)
+        approche = np.hypot(positions[:, None, 0] - starts[None, :, 0], positions[:, None, 1] - starts[None, :, 1])
+        return cls(np.arange(1, len(positions) + 1, dtype=float), paires, costs[None, :] + approche)
+
+    def dpop_entries(self):
+        """Nombre d'entrées du message UTIL de la feuille pour solve_dpop."""
+        return self.num_taxis ** self.num_tasks if self.num_tasks else 0
+
+    def cost(self, assignment):
+        """Coût total d'une affectation (n,) ou d'un lot d'affectations (m, n)."""
+        x = np.atleast_2d(assignment)
+        total = self.preferences[x].sum(axis=1)
+        total += (self.paires[None] * (x[:, :, None] == x[:, None, :])).sum(axis=(1, 2))
+        for k in range(self.num_taxis):
+            premiere = np.full(len(x), self.num_tasks - 1)
+            if self.num_tasks > 1:
+                confiees = x[:, :-1] == k
+                premiere = np.where(confiees.any(axis=1), confiees.argmax(axis=1), premiere)
+            total += self.couts_taxi[k, premiere]
+        return total if np.ndim(assignment) == 2 else float(total[0])
+
+    def _local_costs(self, x):
+        """local[i, v] : coût total si la tâche i passe au taxi v, les autres tâches restant inchangées.
+
+        Calculé par variations autour du coût de x, en O(n·K + n²) : préférence, paires avec les tâches du même
+        taxi, et changement de première tâche de l'ancien et du nouveau taxi dans cout_taxi (local[i, x[i]] vaut
+        exactement cost(x)).
+        """
+        n, K = self.num_tasks, self.num_taxis
+        rows = np.arange(n)
+        delta = self.preferences[None, :] - self.preferences[x][:, None]
+
+        # meme[i, v] : somme des different_i_j sur les tâches j confiées au taxi v
+        paires = self.paires + self.paires.T
+        meme = np.stack([paires[:, x == k].sum(axis=1) for k in range(K)], axis=1)
+        delta += meme - meme[rows, x][:, None]
+
+        # cout_taxi_k ne dépend que de la première tâche i < n - 1 de k (n - 1 à défaut) : la tâche n - 1 n'y
+        # change rien, une autre tâche i peut retirer la première tâche de son taxi ou devenir celle du nouveau
+        premiere = np.full(K, n - 1)
+        seconde = np.full(K, n - 1)
+        for k in range(K):
+            confiees = np.flatnonzero(x[:-1] == k)[:2]
+            premiere[k] = confiees[0] if len(confiees) else n - 1
+            seconde[k] = confiees[1] if len(confiees) > 1 else n - 1
+        actuel = self.couts_taxi[np.arange(K), premiere]
+        i = rows[:-1, None]
+        ajout = self.couts_taxi[np.arange(K)[None, :], np.minimum(premiere[None, :], i)] - actuel[None, :]
+        a = x[:-1]
+        retrait = np.where(premiere[a] == rows[:-1], self.couts_taxi[a, seconde[a]] - actuel[a], 0)
+        taxi = ajout + retrait[:, None]
+        taxi[rows[:-1], a] = 0
+        delta[:-1] += taxi
+
+        delta[rows, x] = 0
+        return self.cost(x) + delta
+
+    # -------------------------------
+    # Résolution exacte (DPOP)
+    # -------------------------------
+    def solve_dpop(self, max_entries=DPOP_MAX_ENTRIES):
+        """Affectation optimale par propagation d'utilités (DPOP) sur le pseudo-arbre task_1 - ... - task_n.
+
+        Le graphe de contraintes est complet (different_i_j pour toutes les paires, cout_taxi_k sur toutes les
+        tâches) : le pseudo-arbre est une chaîne, et le message UTIL de la feuille a num_taxis ** num_tasks entrées.
+        Chaque contrainte est rattachée à sa variable la plus profonde ; la phase VALUE redescend la chaîne.
+        """
+        n, K = self.num_tasks, self.num_taxis
+        if n == 0:
+            return np.zeros(0, dtype=np.int64), 0
+        if self.dpop_entries() > max_entries:
+            raise ValueError(f"DPOP : table de {K}^{n} entrées au-delà de max_entries={max_entries}, "
+                             f"utiliser une recherche locale (DSA, MGM)")
+
+        def axe(i):
+            return np.arange(K).reshape([K if a == i else 1 for a in range(n)])
+
+        # Contraintes cout_taxi_k, qui portent sur toutes les tâches : rattachées à la feuille
+        util = np.zeros([K] * n)
+        for k in range(K):
+            table = np.full([1] * n, self.couts_taxi[k, n - 1])
+            for i in reversed(range(n - 1)):
+                table = np.where(axe(i) == k, self.couts_taxi[k, i], table)
+            util = util + table
+
+        # Phase UTIL : de la feuille vers la racine, élimination de la variable i par minimisation
+        choix = [None] * n
+        for i in reversed(range(n)):
+            util = util + self.preferences.reshape([K if a == i else 1 for a in range(i + 1)])
+            for h in range(i):
+                egal = (axe(h) == axe(i))[(slice(None),) * (i + 1) + (0,) * (n - i - 1)]
+                util = util + self.paires[h, i] * egal
+            choix[i] = util.argmin(axis=i)
+            util = util.min(axis=i)
+
+        # Phase VALUE : de la racine vers la feuille
+        assignment = np.zeros(n, dtype=np.int64)
+        for i in range(n):
+            assignment[i] = choix[i][tuple(assignment[:i])]
+        return assignment, float(util)
+
+    # -------------------------------
+    # Recherche locale (DSA, MGM)
+    # -------------------------------
+    def solve_dsa(self, stop_cycle=30, probability=0.7, rng=None):
+        """DSA synchrone : à chaque cycle, chaque tâche passe avec la probabilité donnée à son meilleur taxi,
+        si ce changement diminue le coût. Renvoie (affectation, coût, cycles)."""
+        rng = np.random.default_rng() if rng is None else rng
+        x = rng.integers(0, self.num_taxis, self.num_tasks)
+        if self.num_tasks == 0:
+            return x, 0, 0
+        for cycle in range(stop_cycle):
+            local = self._local_costs(x)
+            best = local.argmin(axis=1)
+            better = local[np.arange(self.num_tasks), best] < local[np.arange(self.num_tasks), x]
+            x = np.where(better & (rng.random(self.num_tasks) < probability), best, x)
+        return x, self.cost(x), stop_cycle
+
+    def solve_mgm(self, stop_cycle=30, rng=None):
+        """MGM : à chaque cycle, seule la tâche au plus grand gain change de taxi (toutes les tâches sont voisines).
+        S'arrête sur un optimum local ou après stop_cycle cycles. Renvoie (affectation, coût, cycles)."""
+        rng = np.random.default_rng() if rng is None else rng
+        x = rng.integers(0, self.num_taxis, self.num_tasks)
+        if self.num_tasks == 0:
+            return x, 0, 0
+        cycle = 0
+        for cycle in range(1, stop_cycle + 1):
+            local = self._local_costs(x)
+            gains = local[np.arange(self.num_tasks), x] - local.min(axis=1)
+            i = int(gains.argmax())
+            if gains[i] <= 0:
+                break
+            x[i] = local[i].argmin()
+        return x, self.cost(x), cycle
+
+
+def solve(problem, algorithm="dpop", rng=None, **params):
+    """Résoudre un ProblemeDCOP et renvoyer le résultat au format JSON de pydcop solve (lu par lire_donnes)."""
+    start = time.perf_counter()
+    if algorithm == "dpop":
+        assignment, cost = problem.solve_dpop(**params)
+        cycle = 0
+    elif algorithm == "dsa":
+        assignment, cost, cycle = problem.solve_dsa(rng=rng, **params)
+    elif algorithm == "mgm":
+        assignment, cost, cycle = problem.solve_mgm(rng=rng, **params)
+    else:
+        raise ValueError(f"Algorithme DCOP inconnu : {algorithm}")
+    return {
+        "assignment": {f"task_{i + 1}": f"taxi_{k + 1}" for i, k in enumerate(assignment.tolist())},
+        "cost": float(cost),
+        "cycle": cycle,
+        "status": "FINISHED",
+        "time": time.perf_counter() - start,
+        "violation": 0,
+    }
+
+
+# -------------------------------
+# Instances de l'étude pydcop, résolues dans le processus
+# -------------------------------
+def iter_instances(sim, task_number=3, seed=None):
+    """Instances d'une simulation de l'étude pydcop (protocole de generate_files) : 20 × 20, 3 taxis immobiles, et
+    un nouveau lot de tâches tous les 5 pas de temps sur 30. Produit les couples (temps, environnement).
+
+    Avec une graine, la simulation sim est reproductible : dérivée de (seed, sim).
+    """
+    from modele_cocoma import Environment
+
+    env = Environment(grid_size=20, num_taxis=3, task_frequency=5, task_number=task_number, num_iterations=30,
+                      random_seed=None if seed is None else f"{seed}:{sim}", metrics=False)
+    for time_step in range(0, env.num_iterations, env.task_frequency):
+        env.tasks = []
+        env.generate_tasks()
+        yield time_step, env
+
+
+def resolve_instances(output_root, algorithm="dpop", nb_simulation=10, task_number=3, seed=None, **params):
+    """Même protocole que generate_files puis dpop_resolve.sh / dsa_resolve.sh, sans fichiers YAML : chaque
+    instance est résolue et écrite dans output_root/inst_<simulation>/result_<temps>."""
+    for sim in range(1, nb_simulation + 1):
+        rng = None if seed is None else np.random.default_rng([seed, sim])
+        instance_folder = os.path.join(output_root, f"inst_{sim}")
+        os.makedirs(instance_folder, exist_ok=True)
+        for time_step, env in iter_instances(sim, task_number, seed):
+            result = solve(ProblemeDCOP.from_environment(env), algorithm, rng=rng, **params)
+            with open(os.path.join(instance_folder, f"result_{time_step}"), "w") as f:
+                json.dump(result, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Résolution DCOP dans le processus des instances de l'étude pydcop.")
+    parser.add_argument("output_root", help="répertoire des résultats, par exemple results_dpop_3_taxis_3_taches")
+    parser.add_argument("-a", "--algorithm", choices=("dpop", "dsa", "mgm"), default="dpop")
+    parser.add_argument("--stop-cycle", type=int, default=30, help="nombre maximal de cycles (DSA, MGM)")
+    parser.add_argument("--task-number", type=int, default=3)
+    parser.add_argument("--nb-simulation", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    params = {} if args.algorithm == "dpop" else {"stop_cycle": args.stop_cycle}
+    start = time.perf_counter()
+    resolve_instances(args.output_root, args.algorithm, args.nb_simulation, args.task_number, args.seed, **params)
+    print(f"Instances résolues en {time.perf_counter() - start:.2f} s")
@@ -0,0 +1,151 @@
+import math
+import numpy as np
+
+from ordonnancement_cocoma import matrices_route
+
+
+def calculate_distance(pos1, pos2):
+    return math.sqrt((pos1[0] - pos2[0]) ** 2 + (pos1[1] - pos2[1]) ** 2)
+
+
+def _distances(points1, points2):
+    """Distances euclidiennes entre deux tableaux de points (n×2) et (m×2), renvoyées en matrice n×m."""
+    return np.hypot(points1[:, None, 0] - points2[None, :, 0], points1[:, None, 1] - points2[None, :, 1])
+
+
+def dense_capacity(num_taxis, max_bytes=64 * 2 ** 20, max_tasks=4096):
+    """Nombre maximal de tâches pour lequel les matrices denses (tâches × tâches et taxis × tâches) tiennent dans
+    max_bytes octets."""
+    entries = max_bytes // 8
+    capacity = int((-num_taxis + math.sqrt(num_taxis ** 2 + 4 * entries)) / 2)
+    return max(0, min(max_tasks, capacity))
+
+
+# -------------------------------
+# Matrice de distances partagée
+# -------------------------------
+class DistanceMatrix:
+    """Distances précalculées entre la fin et le début des tâches, et entre la position des taxis et le début des tâches.
+
+    Chaque tâche enregistrée reçoit un indice (task.index) ; les matrices sont complétées par blocs lorsque des tâches
+    sont ajoutées ou qu'un taxi se déplace. Au-delà de max_tasks tâches, les matrices denses sont abandonnées et
+    les blocs demandés sont calculés à la volée à partir des coordonnées.
+    """
+
+    def __init__(self, max_tasks=4096):
+        self.max_tasks = max_tasks
+        self.num_tasks = 0
+        self.starts = np.empty((0, 2))  # Début des tâches
+        self.ends = np.empty((0, 2))    # Fin des tâches
+        self.costs = np.empty(0)        # Coût propre des tâches
+        self.end_start = np.empty((0, 0))  # end_start[i, j] : fin de i -> début de j
+        self.taxi_positions = np.empty((0, 2))
+        self.taxi_start = np.empty((0, 0))  # taxi_start[k, j] : position du taxi k -> début de j
+
+    @property
+    def dense(self):
+        return self.num_tasks <= self.max_tasks
+
+    def _grow(self, capacity):
+        """Agrandir les tableaux (doublement de la capacité) pour accueillir capacity tâches."""
+        old = len(self.costs)
+        if capacity <= old:
+            return
+        new = max(capacity, 2 * old, 16)
+        if capacity <= self.max_tasks:
+            new = min(new, self.max_tasks)
+        self.starts = np.concatenate([self.starts, np.zeros((new - old, 2))])
+        self.ends = np.concatenate([self.ends, np.zeros((new - old, 2))])
+        self.costs = np.concatenate([self.costs, np.zeros(new - old)])
+        if capacity <= self.max_tasks:
+            end_start = np.zeros((new, new))
+            end_start[:old, :old] = self.end_start
+            self.end_start = end_start
+            taxi_start = np.zeros((len(self.taxi_positions), new))
+            taxi_start[:, :old] = self.taxi_start
+            self.taxi_start = taxi_start
+
+    def add_tasks(self, tasks):
+        """Enregistrer de nouvelles tâches et calculer uniquement les lignes et colonnes qui les concernent."""
+        if not tasks:
+            return
+        first = self.num_tasks
+        last = first + len(tasks)
+        self._grow(last)
+        for offset, task in enumerate(tasks):
+            task.index = first + offset
+        self.starts[first:last] = [task.start for task in tasks]
+        self.ends[first:last] = [task.end for task in tasks]
+        self.costs[first:last] = [task.cost for task in tasks]
+        self.num_tasks = last
+
+        if not self.dense:
+            # Trop de tâches : on libère les matrices denses
+            self.end_start = np.empty((0, 0))
+            self.taxi_start = np.empty((0, 0))
+            return
+        self.end_start[:last, first:last] = _distances(self.ends[:last], self.starts[first:last])
+        self.end_start[first:last, :first] = _distances(self.ends[first:last], self.starts[:first])
+        self.taxi_start[:, first:last] = _distances(self.taxi_positions, self.starts[first:last])
+
+    def add_taxi(self, taxi_id, position):
+        """Enregistrer un taxi (les identifiants sont attribués de 0 à num_taxis - 1)."""
+        if taxi_id >= len(self.taxi_positions):
+            missing = taxi_id + 1 - len(self.taxi_positions)
+            self.taxi_positions = np.concatenate([self.taxi_positions, np.zeros((missing, 2))])
+            if self.dense:
+                self.taxi_start = np.concatenate([self.taxi_start, np.zeros((missing, self.taxi_start.shape[1]))])
+        self.move_taxi(taxi_id, position)
+
+    def move_taxi(self, taxi_id, position):
+        """Mettre à jour la ligne du taxi après un déplacement."""
+        self.taxi_positions[taxi_id] = position
+        if self.dense:
+            self.taxi_start[taxi_id, :self.num_tasks] = np.hypot(
+                self.starts[:self.num_tasks, 0] - position[0], self.starts[:self.num_tasks, 1] - position[1]
+            )
+
+    # Lecture des distances
+    def end_to_start(self, rows, cols):
+        """Bloc des distances fin des tâches rows -> début des tâches cols."""
+        if self.dense:
+            return self.end_start[np.ix_(rows, cols)]
+        return _distances(self.ends[rows], self.starts[cols])
+
+    def taxi_to_start(self, taxi_id, cols):
+        """Distances de la position du taxi vers le début des tâches cols."""
+        if self.dense:
+            return self.taxi_start[taxi_id, cols]
+        return self.position_to_start(self.taxi_positions[taxi_id], cols)
+
+    def position_to_start(self, position, cols):
+        """Distances d'une position quelconque vers le début des tâches cols."""
+        starts = self.starts[cols]
+        return np.hypot(starts[:, 0] - position[0], starts[:, 1] - position[1])
+
+    def start_to_start(self, rows, cols):
+        return _distances(self.starts[rows], self.starts[cols])
+
+    def end_to_end(self, rows, cols):
+        return _distances(self.ends[rows], self.ends[cols])
+
+    def indices(self, tasks):
+        """Indices des tâches dans la matrice, ou None si l'une d'elles n'est pas enregistrée."""
+        indices = [getattr(task, "index", None) for task in tasks]
+        if any(index is None for index in indices):
+            return None
+        return np.array(indices, dtype=np.int64)
+
+    def ensure(self, tasks):
+        """Indices des tâches, en enregistrant au passage celles qui ne le sont pas encore."""
+        missing = [task for task in tasks if getattr(task, "index", None) is None]
+        if missing:
+            self.add_tasks(missing)
+        return np.array([task.index for task in tasks], dtype=np.int64)
+
+    def route_arrays(self, tasks, start_position):
+        """Coûts d'une tournée (départ -> début, fin -> début, coût propre) lus dans la matrice."""
+        indices = self.indices(tasks)
+        if indices is None:
+            return matrices_route(tasks, start_position)
+        return self.position_to_start(start_position, indices), self.end_to_start(indices, indices), self.costs[indices]
@@ -0,0 +1,166 @@
+import argparse
+import contextlib
+import cProfile
+import functools
+import os
+import time
+from array import array
+
+import numpy as np
+
+from simulation_cocoma import Observer, Simulator
+
+
+# -------------------------------
+# Compteurs et chronomètres
+# -------------------------------
+class Metrics(dict):
+    """Compteurs (enchères calculées, tours d'enchères, appels d'ordonnancement, ...) et durées cumulées en secondes,
+    consultables comme un dictionnaire nom -> valeur."""
+
+    enabled = True
+
+    def count(self, name, n=1):
+        self[name] = self.get(name, 0) + n
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        """Ajouter à self[name] la durée du bloc with."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self[name] = self.get(name, 0.0) + time.perf_counter() - start
+
+
+class NullMetrics(Metrics):
+    """Mesures désactivées : les compteurs et chronomètres ne font rien et le dictionnaire reste vide."""
+
+    enabled = False
+
+    def count(self, name, n=1):
+        pass
+
+    def timer(self, name):
+        return contextlib.nullcontext()
+
+
+def instrumented(counter, timer):
+    """Décorateur de méthode : compter les appels dans self.metrics[counter] et cumuler leur durée dans
+    self.metrics[timer]."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = self.metrics
+            metrics.count(counter)
+            with metrics.timer(timer):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# -------------------------------
+# Durées par phase et par pas de temps
+# -------------------------------
+PHASES = ("generation", "bidding", "winner_determination", "ordering", "execution", "rendering")
+
+
+class PhaseProfiler(Observer):
+    """Observateur du Simulator qui mesure la durée de chaque phase à chaque pas de temps.
+
+    Les phases internes à l'allocation (enchères, ordonnancement) sont lues dans env.metrics, qui doit donc être
+    actif ; la détermination des gagnants est le reste du temps d'allocation. Avec profile_dir, la simulation
+    entière est aussi profilée par cProfile, dans profile_dir/allocation_<méthode>.prof.
+    """
+
+    def __init__(self, profile_dir=None):
+        self.samples = {phase: array("d") for phase in PHASES}
+        self.profile_dir = profile_dir
+        self.profile = None
+        self.profile_path = None
+        self._before = {}
+
+    def _times(self, simulator):
+        metrics = simulator.env.metrics
+        return {name: metrics.get(name, 0.0) for name in ("time_bidding", "time_ordering")}
+
+    def on_start(self, simulator):
+        if self.profile_dir is not None:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            self.profile_path = os.path.join(self.profile_dir, f"allocation_{simulator.allocation_method}.prof")
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    def before_step(self, simulator):
+        self._before = self._times(simulator)
+
+    def after_step(self, simulator, metrics):
+        after = self._times(simulator)
+        bidding = after["time_bidding"] - self._before.get("time_bidding", 0.0)
+        ordering = after["time_ordering"] - self._before.get("time_ordering", 0.0)
+        self.samples["generation"].append(metrics["generation_time"])
+        self.samples["bidding"].append(bidding)
+        self.samples["winner_determination"].append(max(metrics["allocation_time"] - bidding - ordering, 0.0))
+        self.samples["ordering"].append(ordering)
+        self.samples["execution"].append(metrics["execution_time"])
+        self.samples["rendering"].append(metrics["render_time"])
+
+    def on_end(self, simulator):
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile.dump_stats(self.profile_path)
+            self.profile = None
+
+    def summary(self):
+        """Histogramme résumé de chaque phase : nombre de pas, total, p50, p95 et maximum (en secondes)."""
+        summary = {}
+        for phase, samples in self.samples.items():
+            values = np.frombuffer(samples, dtype=float) if len(samples) else np.zeros(1)
+            p50, p95 = np.percentile(values, [50, 95])
+            summary[phase] = {"count": len(samples), "total": float(values.sum()), "p50": float(p50),
+                              "p95": float(p95), "max": float(values.max())}
+        return summary
+
+
+def format_summary(summary):
+    """Tableau texte d'un résumé de PhaseProfiler (durées en millisecondes)."""
+    lines = [f"  {'phase':<22}{'total':>10}{'p50':>10}{'p95':>10}{'max':>10}"]
+    for phase, stats in summary.items():
+        lines.append(f"  {phase:<22}" + "".join(f"{stats[key] * 1000:10.3f}" for key in ("total", "p50", "p95", "max")))
+    return "\n".join(lines)
+
+
+def profile_methods(allocation_methods, num_steps=None, ordonancement_method=0, profile_dir=None, **env_parameters):
+    """Simuler le même scénario (même graine) avec chaque méthode d'allocation et renvoyer {méthode: résumé}."""
+    from modele_cocoma import Environment
+
+    results = {}
+    for method in allocation_methods:
+        env = Environment(**env_parameters)
+        profiler = PhaseProfiler(profile_dir)
+        Simulator(env, allocation_method=method, ordonancement_method=ordonancement_method,
+                  observers=[profiler]).run(num_steps)
+        results[method] = profiler.summary()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Durées par phase (p50/p95/max) de chaque méthode d'allocation.")
+    parser.add_argument("--allocation", type=int, nargs="+", default=[0, 2, 3, 4, 5])
+    parser.add_argument("--ordonancement", type=int, default=0)
+    parser.add_argument("--num-taxis", type=int, nargs="+", default=[3, 30, 300])
+    parser.add_argument("--grid-size", type=int, default=100)
+    parser.add_argument("--task-frequency", type=int, default=5)
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile-dir", help="répertoire des profils cProfile, un par méthode")
+    args = parser.parse_args()
+
+    for num_taxis in args.num_taxis:
+        profile_dir = None if args.profile_dir is None else os.path.join(args.profile_dir, f"taxis_{num_taxis}")
+        results = profile_methods(args.allocation, args.steps, args.ordonancement, profile_dir,
+                                  grid_size=args.grid_size, num_taxis=num_taxis, task_frequency=args.task_frequency,
+                                  task_number=2 * num_taxis, num_iterations=args.steps, random_seed=args.seed)
+        for method, summary in results.items():
+            print(f"\n{num_taxis} taxis, allocation {method} (ms)")
+            print(format_summary(summary))
@@ -0,0 +1,1010 @@
+import logging
+import random
+import time
+import heapq
+import numpy as np
+from ordonnancement_cocoma import (held_karp, held_karp_table, held_karp_ordre, branch_and_bound, christofides,
+                                  recherche_locale, CacheTournees)
+from distances_cocoma import DistanceMatrix, calculate_distance, dense_capacity
+from affectation_cocoma import hungarian
+from dcop_cocoma import DPOP_MAX_ENTRIES, ProblemeDCOP, solve as solve_dcop
+from spatial_cocoma import GrilleSpatiale
+from trajectoires_cocoma import DEFAULT_CAPACITY, TrajectoryLog, ring_buffer
+from instrumentation_cocoma import Metrics, NullMetrics, instrumented
+
+# Journal des décisions (enchères, gagnants, déplacements) ; muet tant que le niveau DEBUG n'est pas activé
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Classes principales
+# -------------------------------
+class Task:
+    __slots__ = ("start", "end", "cost", "index")
+
+    def __init__(self, start, end):
+        self.start = start  # Position de départ (x, y)
+        self.end = end      # Position d'arrivée (x, y)
+        self.cost = self.calculate_distance(start, end)
+        self.index = None   # Indice dans la matrice de distances de l'environnement
+
+    def calculate_distance(self, pos1, pos2):
+        return calculate_distance(pos1, pos2)
+
+    def __repr__(self):
+        return f"Task(start={self.start}, end={self.end}, cost={self.cost:.2f})"
+
+
+class Fleet:
+    """État de la flotte en colonnes (une ligne par taxi, d'indice taxi_id) pour les opérations groupées.
+
+    Les taxis y recopient leur position, leur coût total et l'indice de leur tâche en cours à chaque modification,
+    ainsi que le nombre de tâches terminées retirées de leur plan (Taxi.archive_completed).
+    """
+    __slots__ = ("positions", "total_costs", "current_task_index", "archived")
+
+    def __init__(self, num_taxis=0):
+        self.positions = np.zeros((num_taxis, 2))
+        self.total_costs = np.zeros(num_taxis)
+        self.current_task_index = np.zeros(num_taxis, dtype=np.int64)
+        self.archived = np.zeros(num_taxis, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.total_costs)
+
+    def add_taxi(self, taxi_id, position):
+        """Enregistrer un taxi, en agrandissant les colonnes si nécessaire."""
+        if taxi_id >= len(self):
+            missing = taxi_id + 1 - len(self)
+            self.positions = np.concatenate([self.positions, np.zeros((missing, 2))])
+            self.total_costs = np.concatenate([self.total_costs, np.zeros(missing)])
+            self.current_task_index = np.concatenate([self.current_task_index, np.zeros(missing, dtype=np.int64)])
+            self.archived = np.concatenate([self.archived, np.zeros(missing, dtype=np.int64)])
+        self.positions[taxi_id] = position
+
+    def total_cost(self):
+        return float(self.total_costs.sum())
+
+    def completed(self):
+        """Nombre total de tâches terminées par la flotte."""
+        return int(self.current_task_index.sum() + self.archived.sum())
+
+    def distances_to(self, position):
+        """Distances de chaque taxi à une position."""
+        return np.hypot(self.positions[:, 0] - position[0], self.positions[:, 1] - position[1])
+
+
+class Taxi:
+    __slots__ = ("taxi_id", "_position", "tasks", "_total_cost", "trajectory", "_current_task_index",
+                 "finished_trajectory", "recent_trajectory", "color", "heuristic_method", "distances", "fleet", "log",
+                 "routes")
+
+    def __init__(self, taxi_id, position, heuristic_method=0, distances=None, rng=None, fleet=None,
+                 trajectory_capacity=DEFAULT_CAPACITY, log=None, routes=None):
+        self.taxi_id = taxi_id
+        self.routes = routes  # Cache des sous-tournées optimales partagé (CacheTournees de l'environnement)
+        self.distances = distances  # Matrice de distances partagée (DistanceMatrix de l'environnement)
+        self.fleet = fleet  # Colonnes de la flotte (Fleet de l'environnement)
+        if distances is not None:
+            distances.add_taxi(taxi_id, position)
+        if fleet is not None:
+            fleet.add_taxi(taxi_id, position)
+        self._position = position  # Position actuelle (x, y)
+        self.tasks = []           # Liste des tâches allouées
+        self._total_cost = 0      # Coût total
+        # Historiques de segments bornés à trajectory_capacity (None pour ne rien oublier)
+        self.trajectory = ring_buffer(trajectory_capacity)  # Segments prévus lors des affectations
+        self._current_task_index = 0  # Index de la tâche en cours
+        self.finished_trajectory = ring_buffer(trajectory_capacity)  # Trajectoires terminées pour affichage
+        self.recent_trajectory = []  # Trajectoires terminées récemment
+        rng = random if rng is None else rng
+        self.color = (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255))  # Couleur aléatoire pour chaque taxi
+        self.heuristic_method = heuristic_method  # Méthode heuristique par défaut
+        self.log = log  # Journal sur disque des segments parcourus (TrajectoryLog), facultatif
+
+    # Attributs recopiés dans les colonnes de la flotte et la matrice de distances
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, position):
+        if self.routes is not None and position != self._position:
+            self.routes.discard_start(self._position)
+        self._position = position
+        if self.fleet is not None:
+            self.fleet.positions[self.taxi_id] = position
+        if self.distances is not None:
+            self.distances.move_taxi(self.taxi_id, position)
+
+    @property
+    def total_cost(self):
+        return self._total_cost
+
+    @total_cost.setter
+    def total_cost(self, total_cost):
+        self._total_cost = total_cost
+        if self.fleet is not None:
+            self.fleet.total_costs[self.taxi_id] = total_cost
+
+    @property
+    def current_task_index(self):
+        return self._current_task_index
+
+    @current_task_index.setter
+    def current_task_index(self, index):
+        self._current_task_index = index
+        if self.fleet is not None:
+            self.fleet.current_task_index[self.taxi_id] = index
+
+    def calculate_distance(self, pos1, pos2):
+        return calculate_distance(pos1, pos2)
+
+    # def assign_task(self, task):
+    #     """Assigner une tâche au taxi et mettre à jour le coût."""
+    #     self.tasks.append(task)
+
+    #     #self.total_cost += self.calculate_distance(self.position, task.start) + self.calculate_distance(task.start, task.end)
+
+    #     # Ajouter la trajectoire vers la position de départ et la destination
+    #     self.trajectory.append((self.position, task.start))
+    #     self.trajectory.append((task.start, task.end))
+
+    def execute_task(self):
+        """Exécuter la tâche en cours et gérer les trajectoires."""
+        if self.current_task_index < len(self.tasks):
+            task = self.tasks[self.current_task_index]
+
+            # Si le taxi doit d'abord se rendre au point de départ
+            if self.position != task.start:
+                self.recent_trajectory.append((self.position, task.start))
+                old_position = self.position
+                self.position = task.start
+                logger.debug("Taxi %s moved from position %s to position %s", self.taxi_id, old_position, self.position)
+            else:
+                # Aller à la destination
+                self.recent_trajectory.append((self.position, task.end))
+                old_position = self.position
+                self.position = task.end
+                logger.debug("Taxi %s moved from position %s to position %s", self.taxi_id, old_position, self.position)
+
+                # Passer à la tâche suivante
+                self.current_task_index += 1
+                if self.routes is not None and task.index is not None:
+                    self.routes.discard_task(task.index)
+        
+    def archive_completed(self):
+        """Retirer du plan les tâches terminées et les renvoyer : le plan commence alors à la tâche en cours.
+
+        Les enchères et l'ordonnancement ne parcourent plus que la suite du plan, quelle que soit la durée écoulée.
+        """
+        done = self.current_task_index
+        if not done:
+            return []
+        completed, self.tasks = self.tasks[:done], self.tasks[done:]
+        if self.fleet is not None:
+            self.fleet.archived[self.taxi_id] += done
+        self.current_task_index = 0
+        return completed
+
+    def _indices(self, task):
+        """Indices (tâches du taxi, tâche) dans la matrice partagée, ou None si elle ne peut pas être utilisée."""
+        if self.distances is None or task.index is None:
+            return None
+        indices = self.distances.indices(self.tasks)
+        if indices is None:
+            return None
+        return indices, task.index
+
+    def update_trajectories(self, time=None):
+        """Mettre à jour les trajectoires pour les afficher un pas de temps supplémentaire."""
+        if self.log is not None:
+            self.log.write(time, self.taxi_id, self.recent_trajectory)
+        self.finished_trajectory.extend(self.recent_trajectory)
+        self.recent_trajectory = []  # Réinitialiser les nouvelles trajectoires
+
+        
+    def reset_finished_trajectory(self):
+        """Réinitialiser la trajectoire terminée."""
+        self.finished_trajectory.clear()
+
+    def __repr__(self):
+        return f"Taxi(id={self.taxi_id}, position={self.position}, total_cost={self.total_cost:.2f})"
+    
+    # def calculate_marginal_cost(self, task):
+    #     """Calcule le coût marginal d'ajout de cette tâche au plan actuel."""
+    #     current_cost = self.total_cost
+    #     all_tasks = self.tasks + [task]
+    #     start_position = self.position if not self.tasks else self.tasks[-1].end
+        
+    #     # Optimiser l'ordre des tâches pour le taxi choisi
+    #     optimized_order, optimized_cost = env.optimize_task_order(all_tasks, start_position)
+
+    #     marginal_cost = optimized_cost - current_cost
+    #     return marginal_cost
+
+
+    # Les 2 methodes du cours: Heuristique de Prim et Heuristique par insertion
+    def prim_heuristic(self, task):
+        """Calculer le coût minimum (marginal) pour rejoindre le point de départ d'une tâche."""
+        indices = self._indices(task)
+        if indices is not None:
+            tasks_idx, task_idx = indices
+            if not self.tasks:
+                return float(self.distances.taxi_to_start(self.taxi_id, [task_idx])[0])
+            # La fin de la dernière tâche fait partie des fins de tâches parcourues
+            return float(self.distances.end_to_start(tasks_idx, [task_idx]).min())
+
+        initial_position = self.position if not self.tasks else self.tasks[-1].end
+        min_cost = self.calculate_distance(initial_position, task.start)
+        for t in self.tasks:
+            min_cost = min(min_cost, self.calculate_distance(t.end, task.start))
+        return min_cost
+
+    def insert_task_heuristic(self, task):
+        """Calculer le coût minimum pour insérer une tâche dans le plan actuel."""
+        indices = self._indices(task)
+        if indices is not None:
+            return self._insert_task_heuristic_matrix(task, *indices)
+
+        pos0 = self.position if not self.tasks else self.tasks[-1].end
+        min_cost = float('inf')
+
+        # Cas particulier : aucune tâche encore assignée
+        if len(self.tasks) == 0:
+            return self.calculate_distance(pos0, task.start) + self.calculate_distance(task.start, task.end)
+
+        # Insertion entre deux tâches existantes
+        for i in range(len(self.tasks)):
+            pos1 = self.tasks[i].start
+            pos2 = self.tasks[i].end
+            cost = (
+                self.calculate_distance(pos0, pos1) +
+                self.calculate_distance(task.start, pos1) +
+                self.calculate_distance(task.end, pos2)
+            )
+            min_cost = min(min_cost, cost)
+
+        # Insertion au début des tâches
+        distance_initial = self.calculate_distance(pos0, self.tasks[0].start)
+        distance_with_task = self.calculate_distance(task.end, self.tasks[0].start)
+        min_cost = min(min_cost, distance_initial + distance_with_task)
+
+        # Insertion à la fin des tâches
+        distance_initial = self.calculate_distance(self.tasks[-1].end, pos0)
+        distance_with_task = self.calculate_distance(self.tasks[-1].end, task.start)
+        min_cost = min(min_cost, distance_initial + distance_with_task)
+
+        return min_cost
+
+    def _insert_task_heuristic_matrix(self, task, tasks_idx, task_idx):
+        """Même calcul que insert_task_heuristic, à partir de la matrice de distances."""
+        distances = self.distances
+        if len(tasks_idx) == 0:
+            return float(distances.taxi_to_start(self.taxi_id, [task_idx])[0]) + task.cost
+
+        last = tasks_idx[-1:]
+        # Insertion entre deux tâches existantes
+        between = (
+            distances.end_to_start(last, tasks_idx)[0]
+            + distances.start_to_start([task_idx], tasks_idx)[0]
+            + distances.end_to_end([task_idx], tasks_idx)[0]
+        )
+        # Insertion au début des tâches
+        first = distances.end_to_start(last, tasks_idx[:1])[0, 0] + distances.end_to_start([task_idx], tasks_idx[:1])[0, 0]
+        # Insertion à la fin des tâches (la distance de la dernière tâche à pos0 est nulle)
+        end = distances.end_to_start(last, [task_idx])[0, 0]
+        return float(min(between.min(), first, end))
+    
+    def heuristic(self, task):
+        if self.heuristic_method == 0: # Prim
+            return self.prim_heuristic(task)
+        elif self.heuristic_method == 1: # Insertion
+            return self.insert_task_heuristic(task)
+
+    def bid_heuristic(self, task, heuristic_method):
+        """Calculer l'enchère pour une tâche donnée."""
+        self.heuristic_method = heuristic_method
+        return self.heuristic(task)
+
+    def bid_heuristic_vector(self, tasks_idx, heuristic_method):
+        """Calculer en une fois les enchères du taxi pour les tâches d'indices tasks_idx (mêmes valeurs que bid_heuristic)."""
+        self.heuristic_method = heuristic_method
+        distances = self.distances
+        own_idx = distances.ensure(self.tasks)
+
+        if len(own_idx) == 0:
+            bids = distances.taxi_to_start(self.taxi_id, tasks_idx)
+            if heuristic_method == 1:
+                bids = bids + distances.costs[tasks_idx]
+            return bids
+
+        if heuristic_method == 0:  # Prim
+            return distances.end_to_start(own_idx, tasks_idx).min(axis=0)
+
+        # Insertion
+        last = own_idx[-1:]
+        between = (
+            distances.end_to_start(last, own_idx)[0][:, None]
+            + distances.start_to_start(own_idx, tasks_idx)
+            + distances.end_to_end(own_idx, tasks_idx)
+        ).min(axis=0)
+        first = distances.end_to_start(last, own_idx[:1])[0, 0] + distances.end_to_start(tasks_idx, own_idx[:1])[:, 0]
+        end = distances.end_to_start(last, tasks_idx)[0]
+        return np.minimum(np.minimum(between, first), end)
+
+    def assign_task(self, task):
+        """Assigner une tâche au taxi et optimiser l'ordre des tâches."""
+        self.tasks.append(task)
+        #start_position = self.position if not self.tasks else self.tasks[-1].end
+
+        self.trajectory.append((self.position, task.start))
+        self.trajectory.append((task.start, task.end))
+
+        # Mettre a jour le cout total
+        self.total_cost += self.calculate_distance(self.position, task.start) + self.calculate_distance(task.start, task.end)
+
+        # Pas besoin de le faire, c'est fait dans le lancement du code, après l'allocation des tâches
+        #self.tasks, _ = env.optimize_task_order(self.tasks, start_position) # Reordonner les tâches pour minimiser le coût
+
+def k_best_regrets(bids, k=2):
+    """Regrets des tâches (lignes de bids) : somme des écarts entre les k meilleures enchères et la meilleure.
+
+    Renvoie aussi les k meilleures enchères triées de chaque tâche. Avec un seul taxi, le regret est nul.
+    """
+    k = max(1, min(k, bids.shape[1]))
+    top = np.sort(np.partition(bids, k - 1, axis=1)[:, :k], axis=1)
+    regrets = (top[:, 1:] - top[:, :1]).sum(axis=1) if k > 1 else np.zeros(len(bids))
+    return regrets, top
+
+# -------------------------------
+# Environnement de simulation
+# -------------------------------
+class Environment:
+    def __init__(self, grid_size, num_taxis, task_frequency, task_number, num_iterations, delay=200, ordering_budget=None, random_seed=None,
+                 trajectory_capacity=DEFAULT_CAPACITY, trajectory_log=None, metrics=True,
+                 route_cache_bytes=64 * 2 ** 20):
+        self.grid_size = grid_size
+        self.num_taxis = num_taxis
+        self.task_frequency = task_frequency  # Fréquence d'arrivée des tâches (T)
+        self.task_number = task_number  # Nombre de tâches à générer
+        self.num_iterations = num_iterations  # Nombre total d'itérations
+        self.random_seed = random_seed
+        # Compteurs et durées cumulées par phase (dictionnaire vide si metrics=False)
+        self.metrics = Metrics() if metrics else NullMetrics()
+        # Flux aléatoires indépendants : taxis (positions et couleurs), arrivées des tâches, allocation aléatoire et
+        # égalités du regret. Sans graine, ils sont tous remplacés par le module random global.
+        self.taxi_rng = self.make_rng("taxis")
+        self.arrival_rng = self.make_rng("arrivals")
+        self.allocation_rng = self.make_rng("allocation")
+        self.tie_rng = self.make_rng("ties")
+        # Distances précalculées partagées par les heuristiques et l'ordonnancement, denses tant qu'elles tiennent en mémoire
+        self.distances = DistanceMatrix(max_tasks=dense_capacity(num_taxis))
+        # Tables de Held-Karp des plans des taxis, réutilisées par allocate_tasks_opti (0 octet pour désactiver)
+        self.routes = CacheTournees(route_cache_bytes)
+        self.fleet = Fleet(num_taxis)  # Positions, coûts et avancement des taxis en colonnes
+        # Journal CSV des segments parcourus, pour garder tout l'historique hors mémoire
+        self.trajectory_log = TrajectoryLog(trajectory_log) if trajectory_log is not None else None
+        self.taxis = [Taxi(taxi_id=i, position=self.random_position(self.taxi_rng), distances=self.distances,
+                           rng=self.taxi_rng, fleet=self.fleet, trajectory_capacity=trajectory_capacity,
+                           log=self.trajectory_log, routes=self.routes)
+                      for i in range(num_taxis)]
+        self.tasks = []  # Liste des tâches en attente
+        self.time = 0    # Temps actuel
+        self.delay = delay  # Délai en millisecondes pour ralentir l'exécution (nous n'en aurons plus besoin ici)
+        self.ordering_budget = ordering_budget  # Budget (s) de allocate_tasks_opti, None pour l'ordonnancement exact sans limite
+        # Index spatial des points d'ancrage de l'heuristique de Prim (position du taxi libre, ou fins de ses tâches)
+        self.ancres = GrilleSpatiale(grid_size / max(1, num_taxis) ** 0.5)
+        self._ancres_etat = {}  # Indice du taxi -> (liste de tâches indexée, nombre de tâches indexées, position)
+        self.dcop_result = None  # Dernier résultat de allocate_tasks_dcop
+
+    def close(self):
+        """Écrire sur le disque le journal des trajectoires, s'il y en a un."""
+        if self.trajectory_log is not None:
+            for taxi in self.taxis:
+                taxi.update_trajectories(self.time)  # Segments du dernier pas, pas encore journalisés
+            self.trajectory_log.close()
+
+    def make_rng(self, stream):
+        """Générateur d'un flux aléatoire, dérivé de la graine de l'environnement et du nom du flux.
+
+        La graine est une chaîne, ce qui donne la même suite dans tous les processus (indépendamment de PYTHONHASHSEED).
+        """
+        if self.random_seed is None:
+            return random
+        return random.Random(f"{self.random_seed}:{stream}")
+
+    def random_position(self, rng=None):
+        """Générer une position aléatoire dans la grille (avec le flux des arrivées par défaut)."""
+        rng = self.arrival_rng if rng is None else rng
+        return (rng.randint(0, self.grid_size - 1), rng.randint(0, self.grid_size - 1))
+
+    def generate_tasks(self):
+        """Générer des tâches aléatoires."""
+        with self.metrics.timer("time_generation"):
+            num_tasks = self.arrival_rng.randint(1, self.task_number)  # Par exemple, jusqu'à 1 tâche par taxi
+            new_tasks = [Task(start=self.random_position(), end=self.random_position()) for _ in range(num_tasks)]
+            self.tasks.extend(new_tasks)
+            self.distances.add_tasks(new_tasks)
+        self.metrics.count("tasks_generated", num_tasks)
+        logger.debug("[Time %s] Generated %d new tasks: %s", self.time, len(new_tasks), new_tasks)
+        
+    def allocate_tasks(self, allocation_method=0):
+        """Allouer les tâches aux taxis selon la méthode spécifiée."""
+        pending = len(self.tasks)
+        with self.metrics.timer("time_allocation"):
+            if allocation_method == 0:
+                self.allocate_tasks_random()
+            elif allocation_method == 1: 
+                self.allocate_tasks_opti()
+            elif allocation_method == 2:
+                self.allocate_tasks_psi()
+            elif allocation_method == 3:
+                self.allocate_tasks_ssi()
+            elif allocation_method == 4:
+                self.allocate_tasks_ssi_with_regret()
+            elif allocation_method == 5:
+                self.allocate_tasks_hungarian()
+            elif allocation_method == 6:
+                self.allocate_tasks_dcop("dpop")
+            elif allocation_method == 7:
+                self.allocate_tasks_dcop("dsa")
+        self.metrics.count("tasks_allocated", pending - len(self.tasks))
+
+    def _log_fleet_state(self, title="Final state of taxis:"):
+        """Journaliser les tâches de chaque taxi (coûteux : seulement si le niveau DEBUG est actif)."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n%s", title)
+            for taxi in self.taxis:
+                logger.debug("  Taxi %s: Tasks = %s", taxi, taxi.tasks)
+
+    def allocate_tasks_random(self):
+        """Allouer les tâches aléatoirement aux taxis"""
+        for task in self.tasks:
+            random_taxi = self.allocation_rng.choice(self.taxis)
+            random_taxi.tasks.append(task)
+            logger.debug("Randomly assigned and optimized task %s to Taxi %s", task, random_taxi.taxi_id)
+        
+        # Vider la liste des tâches après l'allocation
+        self.tasks = []
+
+    def allocate_tasks_dcop(self, algorithm="dpop", **params):
+        """Allouer les tâches en résolvant dans le processus le DCOP de generate_file_yaml (pref_*, different_*_*,
+        cout_taxi_*), exactement par DPOP ou par recherche locale (DSA, MGM).
+
+        Le résultat, au format JSON de pydcop solve, est conservé dans self.dcop_result. Si le message UTIL de
+        DPOP dépasse max_entries (num_taxis ** nombre de tâches), le lot est résolu par MGM, avec un avertissement.
+        """
+        if not self.tasks:
+            return
+        rng = np.random.default_rng(self.allocation_rng.getrandbits(64))
+        problem = ProblemeDCOP.from_environment(self)
+        if algorithm == "dpop" and problem.dpop_entries() > params.get("max_entries", DPOP_MAX_ENTRIES):
+            logger.warning("DPOP : %d taxis et %d tâches dépassent la table maximale, résolution par MGM",
+                           problem.num_taxis, problem.num_tasks)
+            algorithm, params = "mgm", {}
+        self.dcop_result = solve_dcop(problem, algorithm, rng=rng, **params)
+        for i, task in enumerate(self.tasks):
+            taxi = self.taxis[int(self.dcop_result["assignment"][f"task_{i + 1}"].split("_")[1]) - 1]
+            taxi.tasks.append(task)
+            logger.debug("DCOP (%s) assigned task %s to Taxi %s", algorithm, task, taxi.taxi_id)
+        logger.debug("DCOP (%s) cost %.2f in %.4f s", algorithm, self.dcop_result["cost"], self.dcop_result["time"])
+
+        self.tasks = []
+
+    # Tres lourd par rapport au temps, mais opti pour l'ordonnancement des tâches - surtout utilise pour tester la partie 1
+    def allocate_tasks_opti(self, ordering_budget=None):
+        """Allouer les tâches aux taxis en minimisant les coûts par rapport a la fonction d'optimisation.
+
+        Avec un budget de temps (en secondes, pour tout l'appel), l'ordonnancement passe par le branch-and-bound :
+        le budget restant est réparti entre les évaluations restantes, qui renvoient la meilleure solution trouvée.
+        """
+        if ordering_budget is None:
+            ordering_budget = self.ordering_budget
+        deadline = None if ordering_budget is None else time.perf_counter() + ordering_budget
+        remaining_evaluations = len(self.tasks) * len(self.taxis)
+
+        for task in self.tasks:
+            costs = []
+            proven_optimal = True
+
+            for taxi in self.taxis:
+                startx, starty = (taxi.position if not taxi.tasks else taxi.tasks[-1].end)
+                all_tasks = [task] + taxi.tasks
+
+                if deadline is not None:
+                    time_budget = max(deadline - time.perf_counter(), 0) / remaining_evaluations
+                    order, cost, optimal = self.optimize_task_order_bnb(all_tasks, (startx, starty), time_budget=time_budget)
+                    proven_optimal = proven_optimal and optimal
+                elif self.routes.max_bytes and len(taxi.tasks) >= self.routes.min_tasks:
+                    order, cost = self.optimal_insertion(task, taxi.tasks, (startx, starty))
+                else:
+                    order, cost = self.optimize_task_order(all_tasks, (startx, starty))
+                remaining_evaluations -= 1
+                costs.append((cost, taxi, order))
+
+            costs.sort(key=lambda x: x[0])
+            best_cost, best_taxi, best_order = costs[0]
+            best_taxi.tasks = best_order
+            self.metrics.count("auction_rounds")
+            logger.debug("Opti assigned task %s to Taxi %s with cost %.2f%s", task, best_taxi.taxi_id, best_cost,
+                         "" if proven_optimal else " (not proven optimal)")
+
+        self.tasks = []
+    
+
+    @instrumented("ordering_calls", "time_ordering")
+    def optimal_insertion(self, task, tasks, start_position):
+        """Ordre optimal (Held-Karp) des tâches tasks augmentées de task, depuis start_position.
+
+        La table des sous-tournées de tasks est lue dans le cache self.routes, ou calculée puis mémorisée : seules
+        les sous-tournées qui contiennent task sont calculées, et les évaluations suivantes d'un même plan
+        (d'autres tâches pour le même taxi) repartent de la même table.
+        """
+        indices = self.distances.ensure([task] + tasks)[1:]
+        entry = self.routes.get(start_position, indices.tolist())
+        if entry is None:
+            self.metrics.count("route_cache_misses")
+            ordre, table = tuple(indices.tolist()), held_karp_table(*self.distances.route_arrays(tasks, start_position))
+            self.routes.put(start_position, ordre, table)
+        else:
+            self.metrics.count("route_cache_hits")
+            ordre, table = entry
+            by_index = dict(zip(indices.tolist(), tasks))
+            tasks = [by_index[index] for index in ordre]
+
+        route = tasks + [task]
+        depart, fin_debut, couts = self.distances.route_arrays(route, start_position)
+        order, min_cost = held_karp_ordre(held_karp_table(depart, fin_debut, couts, base=table), fin_debut, couts)
+        return [route[i] for i in order], min_cost
+
+    # Ordonancement des tâches
+    @instrumented("ordering_calls", "time_ordering")
+    def optimize_task_order(self, tasks, start_position):
+        """Trouver l'ordre optimal des tâches pour minimiser le coût (Held-Karp, O(2^n·n²))."""
+        if not tasks:
+            return [], 0
+        order, min_cost = held_karp(*self.distances.route_arrays(tasks, start_position))
+        return [tasks[i] for i in order], min_cost
+
+    @instrumented("ordering_calls", "time_ordering")
+    def optimize_task_order_bnb(self, tasks, start_position, time_budget=None):
+        """Ordre des tâches par branch-and-bound avec budget de temps optionnel.
+
+        Renvoie (ordre, coût, optimal) : si le budget est épuisé, la meilleure solution trouvée est renvoyée
+        et optimal vaut False.
+        """
+        if not tasks:
+            return [], 0, True
+        order, min_cost, optimal = branch_and_bound(*self.distances.route_arrays(tasks, start_position), time_budget=time_budget)
+        return [tasks[i] for i in order], min_cost, optimal
+    
+    # Amélioration par recherche locale, à enchaîner après n'importe quel ordonnancement
+    @instrumented("ordering_calls", "time_ordering")
+    def improve_task_order(self, tasks, start_position, max_iterations=1000, time_limit=None):
+        """Améliorer l'ordre donné par 2-opt, Or-opt et échanges (voir recherche_locale).
+
+        S'arrête après max_iterations mouvements ou time_limit secondes ; renvoie (ordre, coût).
+        """
+        if not tasks:
+            return [], 0
+        depart, fin_debut, couts = self.distances.route_arrays(tasks, start_position)
+        order, cost = recherche_locale(range(len(tasks)), depart, fin_debut, couts, max_iterations=max_iterations, time_limit=time_limit)
+        return [tasks[i] for i in order], cost
+
+    # Christofides pour l'ordonancement des tâches, plus efficace en temps d'execution, mais pas optimal
+    @instrumented("ordering_calls", "time_ordering")
+    def optimize_task_order_christofides(self, tasks, start_position, matching="greedy"):
+        """Ordre des tâches par une variante de Christofides sur le coût asymétrique (voir christofides).
+
+        matching="greedy" couple les sommets impairs de façon gloutonne (rapide, des centaines de tâches en bien
+        moins d'une seconde) ; matching="exact" utilise le couplage parfait de poids minimal de networkx.
+        """
+        if not tasks:
+            return [], 0
+        order, cost = christofides(*self.distances.route_arrays(tasks, start_position), matching=matching)
+        return [tasks[i] for i in order], cost
+
+    # Greedy task order
+    # A tester
+    @instrumented("ordering_calls", "time_ordering")
+    def greedy_task_order(self, tasks, start_position):
+        if not tasks:
+            return [], 0
+        # Index spatial des débuts de tâches ; en cas d'égalité, la première tâche de la liste l'emporte, comme min
+        index = GrilleSpatiale.from_points(range(len(tasks)), [task.start for task in tasks], self.grid_size)
+        order = []
+        position = start_position
+        while len(index):
+            _, closest = index.nearest(position)
+            index.remove(closest)
+            order.append(tasks[closest])
+            position = tasks[closest].end
+        return order, sum(self.calculate_distance(t1.end, t2.start) for t1, t2 in zip(order[:-1], order[1:]))
+    
+    def calculate_distance(self, pos1, pos2):
+        return calculate_distance(pos1, pos2)
+
+    def calculate_allocation_cost(self):
+        """Coût total de l'allocation : chaque taxi parcourt ses tâches dans l'ordre depuis sa position actuelle."""
+        total_cost = 0
+        for taxi in self.taxis:
+            current_position = taxi.position
+            for task in taxi.tasks:
+                # Rejoindre le début de la tâche puis l'effectuer
+                total_cost += self.calculate_distance(current_position, task.start) + task.cost
+                current_position = task.end
+        return total_cost
+    
+
+    # Partie 3 
+
+    def _sync_ancres(self):
+        """Mettre à jour l'index des ancres de Prim d'après les tâches et positions actuelles des taxis."""
+        for k, taxi in enumerate(self.taxis):
+            etat = self._ancres_etat.get(k)  # (liste de tâches indexée, nombre de fins indexées, position indexée)
+            if etat is not None and etat[0] is taxi.tasks and etat[1] > 0:
+                # Les tâches ne sont qu'ajoutées à la fin de la liste : seules les nouvelles fins sont indexées
+                first = etat[1]
+            elif etat is not None and not taxi.tasks and etat[1] == 0 and etat[2] == taxi.position:
+                continue
+            else:
+                first = 0
+                if etat is not None:
+                    for j in range(-1, etat[1]):
+                        if (k, j) in self.ancres:
+                            self.ancres.remove((k, j))
+                if not taxi.tasks:
+                    self.ancres.insert((k, -1), taxi.position)
+            for j in range(first, len(taxi.tasks)):
+                self.ancres.insert((k, j), taxi.tasks[j].end)
+            self._ancres_etat[k] = (taxi.tasks, len(taxi.tasks), taxi.position)
+
+    def replace_plan_tail(self, taxi, start, tasks):
+        """Remplacer les tâches du taxi à partir de l'indice start, sur place.
+
+        Seules les ancres de Prim de la fin remplacée sont retirées de l'index : le début du plan (par exemple les
+        tâches terminées) n'est pas réindexé à la prochaine enchère.
+        """
+        if start == 0:
+            taxi.tasks = list(tasks)
+            return
+        k = taxi.taxi_id
+        etat = self._ancres_etat.get(k)
+        if etat is not None and etat[0] is taxi.tasks and etat[1] > start:
+            for j in range(start, etat[1]):
+                self.ancres.remove((k, j))
+            self._ancres_etat[k] = (taxi.tasks, start, etat[2])
+        taxi.tasks[start:] = tasks
+
+    def nearest_taxis(self, position, k=1):
+        """Les k taxis dont l'enchère de Prim pour une tâche débutant en position est la plus faible.
+
+        Renvoie une liste [(enchère, indice du taxi)], les égalités étant départagées par le plus petit indice.
+        L'index des ancres doit être à jour (_sync_ancres) : il ne change pas entre les requêtes d'un même tour.
+        """
+        k = min(k, len(self.taxis))
+        count = k
+        while True:
+            result = []
+            seen = set()
+            candidates = self.ancres.k_nearest(position, count)
+            for distance, (taxi_idx, _) in candidates:
+                if taxi_idx not in seen:
+                    seen.add(taxi_idx)
+                    result.append((distance, taxi_idx))
+                    if len(result) == k:
+                        return result
+            if len(candidates) < count:
+                return result
+            count *= 2
+
+    def bid_matrix(self, tasks, heuristic_method=0):
+        """Matrice des enchères (nombre de tâches × nombre de taxis) pour l'heuristique de Prim ou d'insertion."""
+        bids = np.empty((len(tasks), len(self.taxis)))
+        if not tasks:
+            return bids
+        with self.metrics.timer("time_bidding"):
+            tasks_idx = self.distances.ensure(tasks)
+            for k, taxi in enumerate(self.taxis):
+                bids[:, k] = taxi.bid_heuristic_vector(tasks_idx, heuristic_method)
+        self.metrics.count("bids", bids.size)
+        return bids
+
+    # PSI
+    def allocate_tasks_psi(self, heuristic_method=0):
+        """Allocation des tâches avec enchères parallèles (PSI)."""
+        task_allocations = {taxi: [] for taxi in self.taxis}
+
+        if heuristic_method == 0:
+            # Prim : l'enchère d'un taxi est sa distance à la tâche, le gagnant est le propriétaire de l'ancre la plus proche
+            with self.metrics.timer("time_bidding"):
+                self._sync_ancres()  # Les plans ne changent qu'après le tour : une seule mise à jour de l'index
+                winners = [self.nearest_taxis(task.start)[0] for task in self.tasks]
+            self.metrics.count("nearest_taxi_queries", len(self.tasks))
+            bids = [[bid] for bid, _ in winners]
+            winners = [winner_idx for _, winner_idx in winners]
+            bidders = [[self.taxis[winner_idx]] for winner_idx in winners]
+        else:
+            # Chaque taxi soumet une enchère pour chaque tâche
+            bids = self.bid_matrix(self.tasks, heuristic_method)
+            winners = bids.argmin(axis=1) if self.tasks else []  # Le premier taxi avec la meilleure enchère, comme un tri stable
+            bidders = [self.taxis] * len(self.tasks)
+
+        self.metrics.count("auction_rounds")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for task, task_bids, task_bidders, winner_idx in zip(self.tasks, bids, bidders, winners):
+            winner = self.taxis[winner_idx]  # Le taxi avec la meilleure enchère remporte la tâche
+            if debug:
+                logger.debug("\nProcessing task %s:", task)
+                for taxi, bid in zip(task_bidders, task_bids):
+                    logger.debug("  Taxi %s: Bid = %s", taxi, bid)
+                logger.debug("  Winner for task %s: Taxi %s", task, winner)
+
+            # Ajouter la tâche au taxi gagnant
+            task_allocations[winner].append(task)
+
+        # Assigner les tâches aux taxis
+        for taxi in self.taxis:
+            if task_allocations[taxi]:
+                logger.debug("\n[PSI] Assigning tasks to Taxi %s: %s", taxi, task_allocations[taxi])
+                for task in task_allocations[taxi]:
+                    taxi.assign_task(task)
+            else:
+                logger.debug("\nTaxi %s has no tasks assigned.", taxi)
+
+        # Supprimer les tâches allouées de la liste des tâches disponibles
+        allocated_tasks = {id(task) for tasks in task_allocations.values() for task in tasks}
+        self.tasks = [task for task in self.tasks if id(task) not in allocated_tasks]
+
+        # État final des taxis
+        self._log_fleet_state()
+
+
+    
+    # SSI
+    def allocate_tasks_ssi(self, heuristic_method=0, incremental=True):
+        """Allocation des tâches avec enchères Sequential Single-item (SSI).
+
+        En mode incrémental, seules les enchères du taxi gagnant sont recalculées à chaque tour (voir
+        _allocate_tasks_ssi_incremental) ; l'allocation obtenue est identique.
+        """
+        task_allocations = {taxi: [] for taxi in self.taxis}
+        taches_non_allocated = self.tasks
+
+        if incremental:
+            self._allocate_tasks_ssi_incremental(taches_non_allocated, heuristic_method)
+
+        taxi_ids = np.array([taxi.taxi_id for taxi in self.taxis])
+
+        while taches_non_allocated:
+            # Chaque taxi soumet une enchère pour chaque tâche et garde la meilleure
+            bids = self.bid_matrix(taches_non_allocated, heuristic_method)
+            best_tasks = bids.argmin(axis=0)
+            best_bids = bids[best_tasks, np.arange(len(self.taxis))]
+
+            # Meilleure enchère, puis plus petit taxi_id en cas d'égalité
+            winner_idx = np.lexsort((taxi_ids, best_bids))[0]
+            winner = self.taxis[winner_idx]
+            task_done = taches_non_allocated[best_tasks[winner_idx]]
+            self.metrics.count("auction_rounds")
+            logger.debug("  Winner for task %s: Taxi %s", task_done, winner)
+            winner.assign_task(task_done)
+            taches_non_allocated.remove(task_done)
+
+        # Supprimer les tâches allouées de la liste des tâches disponibles
+        allocated_tasks = [task for tasks in task_allocations.values() for task in tasks]
+        self.tasks = [task for task in self.tasks if task not in allocated_tasks]
+
+        # État final des taxis
+        self._log_fleet_state()
+
+    def _allocate_tasks_ssi_incremental(self, taches_non_allocated, heuristic_method):
+        """SSI où chaque taxi garde son vecteur d'enchères et sa meilleure enchère dans une file de priorité.
+
+        Seul le gagnant change de plan à chaque tour : sa colonne est recalculée, et les taxis dont la meilleure
+        tâche vient d'être attribuée relisent leur minimum dans leur colonne en cache. La file est ordonnée par
+        (enchère, taxi_id), comme le départage de la version non incrémentale.
+        """
+        tasks = list(taches_non_allocated)
+        if not tasks or not self.taxis:
+            return
+        tasks_idx = self.distances.ensure(tasks)
+        bids = self.bid_matrix(tasks, heuristic_method)
+        allocated = np.zeros(len(tasks), dtype=bool)
+        best_tasks = bids.argmin(axis=0)
+        stamps = [0] * len(self.taxis)  # Les entrées de la file dont le tampon est dépassé sont ignorées
+        queue = [(bids[best_tasks[k], k], taxi.taxi_id, 0, k) for k, taxi in enumerate(self.taxis)]
+        heapq.heapify(queue)
+
+        for _ in range(len(tasks)):
+            while True:
+                _, _, stamp, winner_idx = heapq.heappop(queue)
+                if stamp == stamps[winner_idx]:
+                    break
+            winner = self.taxis[winner_idx]
+            done_idx = best_tasks[winner_idx]
+            task_done = tasks[done_idx]
+            self.metrics.count("auction_rounds")
+            logger.debug("  Winner for task %s: Taxi %s", task_done, winner)
+            winner.assign_task(task_done)
+            taches_non_allocated.remove(task_done)
+
+            allocated[done_idx] = True
+            bids[done_idx, :] = np.inf
+            remaining = np.flatnonzero(~allocated)
+            if len(remaining) == 0:
+                break
+
+            # Seul le plan du gagnant a changé
+            with self.metrics.timer("time_bidding"):
+                bids[remaining, winner_idx] = winner.bid_heuristic_vector(tasks_idx[remaining], heuristic_method)
+            self.metrics.count("bids", len(remaining))
+            outdated = set(np.flatnonzero(best_tasks == done_idx).tolist())
+            outdated.add(winner_idx)
+            for k in outdated:
+                best_tasks[k] = bids[:, k].argmin()
+                stamps[k] += 1
+                heapq.heappush(queue, (bids[best_tasks[k], k], self.taxis[k].taxi_id, stamps[k], k))
+
+    # SSI avec regret
+    def allocate_tasks_ssi_with_regret(self, heuristic_method=0, k=2, lazy=True, rng=None):
+        """Allocation des tâches avec enchères Sequential Single-item (SSI) en tenant compte des regrets.
+
+        Le regret d'une tâche est la somme des écarts entre ses k meilleures enchères et la meilleure (k=2 :
+        écart entre les deux meilleures). Les égalités de regret sont départagées avec rng (par défaut
+        self.tie_rng). En mode lazy, les regrets sont gardés dans un tas et mis à jour seulement pour les tâches
+        concernées par le gagnant (voir _allocate_tasks_regret_lazy) ; l'allocation obtenue est la même.
+        """
+        task_allocations = {taxi: [] for taxi in self.taxis}
+        taches_non_allocated = self.tasks
+        rng = self.tie_rng if rng is None else rng
+
+        if lazy:
+            self._allocate_tasks_regret_lazy(taches_non_allocated, heuristic_method, k, rng)
+
+        while taches_non_allocated:
+            # Étape 1: Collecter les bids pour chaque tâche de chaque taxi
+            bids_matrix = self.bid_matrix(taches_non_allocated, heuristic_method)
+
+            # DEBUG - Afficher les bids pour chaque tâche et chaque taxi 
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("\nBids Matrix (per task and taxi):")
+                for task, bids in zip(taches_non_allocated, bids_matrix):
+                    logger.debug("  Task %s:", task)
+                    for taxi, bid in zip(self.taxis, bids):
+                        logger.debug("    Taxi %s: Bid = %.2f", taxi, bid)
+
+            # Étape 2: Calculer les regrets pour chaque tâche
+            regrets, _ = k_best_regrets(bids_matrix, k)
+
+            # Étape 3: Trouver la tâche avec le regret maximal
+            # DEBUG - Afficher les regrets pour chaque tâche
+            if debug:
+                logger.debug("\nRegrets for each task:")
+                for task, regret in zip(taches_non_allocated, regrets):
+                    logger.debug("  Task %s: Regret = %.2f", task, regret)
+            max_regret_tasks = np.flatnonzero(regrets == regrets.max())
+
+            # Si plusieurs tâches ont le même regret, choisir une tâche aléatoirement
+            max_regret_idx = rng.choice(max_regret_tasks.tolist())
+            max_regret_task = taches_non_allocated[max_regret_idx]
+
+            # Étape 4: Allouer la tâche avec regret maximal au taxi ayant fait l'offre minimale
+            task_bids = bids_matrix[max_regret_idx]
+            winner = self.taxis[task_bids.argmin()]  # Taxi ayant proposé le bid minimum pour la tâche
+
+            self.metrics.count("auction_rounds")
+            logger.debug("Task %s assigned to Taxi %s with bid %s (Regret = %s)",
+                         max_regret_task, winner, task_bids.min(), regrets[max_regret_idx])
+
+            # Assigner la tâche au taxi gagnant
+            winner.assign_task(max_regret_task)
+            taches_non_allocated.remove(max_regret_task)
+
+        # Supprimer les tâches allouées de la liste des tâches disponibles
+        allocated_tasks = [task for tasks in task_allocations.values() for task in tasks]
+        self.tasks = [task for task in self.tasks if task not in allocated_tasks]
+
+        # État final des taxis
+        self._log_fleet_state()
+
+    # Affectation optimale (méthode hongroise)
+    def allocate_tasks_hungarian(self, heuristic_method=0):
+        """Allocation des tâches par affectation optimale taxi × tâche sur la matrice des enchères.
+
+        À chaque tour, chaque taxi reçoit au plus une tâche et la somme des enchères est minimale ; s'il reste
+        des tâches (plus de tâches que de taxis), les enchères sont recalculées avec les nouveaux plans et un
+        nouveau tour est joué.
+        """
+        taches_non_allocated = self.tasks
+
+        while taches_non_allocated and self.taxis:
+            bids = self.bid_matrix(taches_non_allocated, heuristic_method)
+            tasks_idx, taxis_idx = hungarian(bids)
+            self.metrics.count("auction_rounds")
+            for task_idx, taxi_idx in zip(tasks_idx, taxis_idx):
+                task, taxi = taches_non_allocated[task_idx], self.taxis[taxi_idx]
+                logger.debug("  Hungarian assigned task %s to Taxi %s with bid %.2f", task, taxi, bids[task_idx, taxi_idx])
+                taxi.assign_task(task)
+
+            allocated = set(tasks_idx.tolist())
+            taches_non_allocated[:] = [task for i, task in enumerate(taches_non_allocated) if i not in allocated]
+
+        # État final des taxis
+        self._log_fleet_state()
+
+    def _allocate_tasks_regret_lazy(self, taches_non_allocated, heuristic_method, k, rng):
+        """SSI avec regret sur un tas de regrets (max-heap) mis à jour paresseusement.
+
+        Après chaque attribution, seule la colonne du gagnant est recalculée, et seules les tâches dont il faisait
+        partie des k meilleures enchères, ou dans lesquelles sa nouvelle enchère y entre, voient leur regret
+        recalculé. Les entrées périmées du tas sont ignorées grâce à un tampon par tâche.
+        """
+        tasks = list(taches_non_allocated)
+        if not tasks or not self.taxis:
+            return
+        tasks_idx = self.distances.ensure(tasks)
+        bids = self.bid_matrix(tasks, heuristic_method)
+        regrets, top = k_best_regrets(bids, k)
+        kth_best = top[:, -1]
+        in_top = bids <= kth_best[:, None]  # Taxis parmi les k meilleures enchères (égalités comprises)
+        allocated = np.zeros(len(tasks), dtype=bool)
+        stamps = [0] * len(tasks)
+        heap = [(-regret, t, 0) for t, regret in enumerate(regrets.tolist())]
+        heapq.heapify(heap)
+
+        def pop_valid():
+            while heap:
+                entry = heapq.heappop(heap)
+                if not allocated[entry[1]] and entry[2] == stamps[entry[1]]:
+                    return entry
+            return None
+
+        for _ in range(len(tasks)):
+            # Toutes les tâches de regret maximal, dans l'ordre de la liste, pour un départage reproductible
+            best = pop_valid()
+            candidates = [best]
+            while heap and heap[0][0] == best[0]:
+                entry = pop_valid()
+                if entry is None:
+                    break
+                if entry[0] != best[0]:
+                    heapq.heappush(heap, entry)
+                    break
+                candidates.append(entry)
+            candidates.sort(key=lambda entry: entry[1])
+            chosen = rng.choice(candidates)
+            for entry in candidates:
+                if entry is not chosen:
+                    heapq.heappush(heap, entry)
+
+            done_idx = chosen[1]
+            task_done = tasks[done_idx]
+            winner_idx = int(bids[done_idx].argmin())
+            winner = self.taxis[winner_idx]
+            self.metrics.count("auction_rounds")
+            logger.debug("Task %s assigned to Taxi %s with bid %s (Regret = %s)",
+                         task_done, winner, bids[done_idx, winner_idx], -chosen[0])
+            winner.assign_task(task_done)
+            taches_non_allocated.remove(task_done)
+
+            allocated[done_idx] = True
+            remaining = np.flatnonzero(~allocated)
+            if len(remaining) == 0:
+                break
+
+            # Seul le plan du gagnant a changé : ne recalculer que les regrets qui en dépendent
+            with self.metrics.timer("time_bidding"):
+                new_bids = winner.bid_heuristic_vector(tasks_idx[remaining], heuristic_method)
+            self.metrics.count("bids", len(remaining))
+            affected = remaining[in_top[remaining, winner_idx] | (new_bids < kth_best[remaining])]
+            bids[remaining, winner_idx] = new_bids
+            if len(affected) == 0:
+                continue
+            new_regrets, new_top = k_best_regrets(bids[affected], k)
+            kth_best[affected] = new_top[:, -1]
+            in_top[affected] = bids[affected] <= kth_best[affected, None]
+            for t, regret in zip(affected.tolist(), new_regrets.tolist()):
+                stamps[t] += 1
+                heapq.heappush(heap, (-regret, t, stamps[t]))
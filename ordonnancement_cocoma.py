@@ -0,0 +1,477 @@
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# -------------------------------
+# Matrices de coûts pour l'ordonnancement
+# -------------------------------
+def matrices_route(tasks, start_position):
+    """Construire les coûts d'une tournée : départ -> début des tâches, fin -> début, et coût propre des tâches."""
+    starts = np.array([task.start for task in tasks], dtype=float).reshape(-1, 2)
+    ends = np.array([task.end for task in tasks], dtype=float).reshape(-1, 2)
+    couts = np.array([task.cost for task in tasks], dtype=float)
+
+    depart = np.hypot(starts[:, 0] - start_position[0], starts[:, 1] - start_position[1])
+    fin_debut = np.hypot(ends[:, None, 0] - starts[None, :, 0], ends[:, None, 1] - starts[None, :, 1])
+    return depart, fin_debut, couts
+
+
+def cout_ordre(ordre, depart, fin_debut, couts):
+    """Coût d'un ordre de tâches (indices) avec la même définition que optimize_task_order."""
+    if len(ordre) == 0:
+        return 0
+    total = depart[ordre[0]] + couts[ordre[0]]
+    for i, j in zip(ordre[:-1], ordre[1:]):
+        total += fin_debut[i, j] + couts[j]
+    return float(total)
+
+
+# -------------------------------
+# Held-Karp (programmation dynamique exacte)
+# -------------------------------
+def _transitions(fin_debut, couts):
+    """Coût pour enchaîner i -> j, incluant la réalisation de la tâche j (interdit de i vers i)."""
+    transition = fin_debut + couts[None, :]
+    np.fill_diagonal(transition, np.inf)
+    return transition
+
+
+def held_karp_table(depart, fin_debut, couts, base=None):
+    """Table de Held-Karp : dp[masque, j] est le coût minimal pour réaliser les tâches de `masque` en terminant par
+    la tâche j. Les masques sont traités par nombre de bits croissant, et chaque couche est calculée en bloc avec NumPy.
+
+    base est facultatif : la table des n - 1 premières tâches depuis le même départ. Les masques sans la dernière
+    tâche en sont recopiés et seuls ceux qui la contiennent sont calculés, soit environ la moitié du travail.
+    """
+    n = len(couts)
+    transition = _transitions(fin_debut, couts)
+    nb_masques = 1 << n
+    dp = np.full((nb_masques, n), np.inf)
+    masques = np.arange(nb_masques)
+    if base is None:
+        bits = 1 << np.arange(n)
+        dp[bits, np.arange(n)] = depart + couts
+    else:
+        moitie = nb_masques >> 1
+        dp[:moitie, :n - 1] = base
+        dp[moitie, n - 1] = depart[n - 1] + couts[n - 1]
+        masques = masques[moitie:]
+
+    taille = np.zeros(len(masques), dtype=np.int64)
+    for j in range(n):
+        taille += (masques >> j) & 1
+
+    for k in range(2, n + 1):
+        couche = masques[taille == k]
+        for j in range(n):
+            avec_j = couche[(couche >> j) & 1 == 1]
+            precedents = avec_j ^ (1 << j)
+            dp[avec_j, j] = (dp[precedents] + transition[:, j]).min(axis=1)
+    return dp
+
+
+def held_karp_ordre(dp, fin_debut, couts):
+    """Ordre optimal et son coût, reconstruits à partir d'une table de held_karp_table."""
+    n = len(couts)
+    if n == 0:
+        return [], 0
+    transition = _transitions(fin_debut, couts)
+
+    # Reconstruction de l'ordre en remontant les transitions
+    masque = (1 << n) - 1
+    dernier = int(np.argmin(dp[masque]))
+    min_cost = float(dp[masque, dernier])
+    ordre = [dernier]
+    while masque != (1 << dernier):
+        precedent = masque ^ (1 << dernier)
+        dernier_precedent = int(np.argmin(dp[precedent] + transition[:, dernier]))
+        masque, dernier = precedent, dernier_precedent
+        ordre.append(dernier)
+    ordre.reverse()
+    return ordre, min_cost
+
+
+def held_karp(depart, fin_debut, couts):
+    """Ordre optimal des tâches par programmation dynamique sur les sous-ensembles, en O(2^n·n²)."""
+    n = len(couts)
+    if n == 0:
+        return [], 0
+    if n == 1:
+        return [0], float(depart[0] + couts[0])
+    return held_karp_ordre(held_karp_table(depart, fin_debut, couts), fin_debut, couts)
+
+
+def held_karp_task_order(tasks, start_position):
+    """Ordre optimal d'une liste de tâches depuis start_position, renvoyé comme optimize_task_order."""
+    if not tasks:
+        return [], 0
+    depart, fin_debut, couts = matrices_route(tasks, start_position)
+    ordre, min_cost = held_karp(depart, fin_debut, couts)
+    return [tasks[i] for i in ordre], min_cost
+
+
+# -------------------------------
+# Séparation et évaluation (branch-and-bound)
+# -------------------------------
+def branch_and_bound(depart, fin_debut, couts, time_budget=None):
+    """Ordre optimal des tâches par recherche en profondeur avec élagage.
+
+    La borne inférieure d'une route partielle est son coût, plus, pour chaque tâche restante, son coût propre
+    et le plus petit trajet à vide possible pour rejoindre son point de départ (depuis start_position ou la fin
+    d'une autre tâche). Si time_budget (en secondes) est dépassé, la meilleure solution trouvée est renvoyée.
+    Renvoie (ordre, coût, optimal) où optimal indique si l'optimalité a été prouvée.
+    """
+    n = len(couts)
+    if n == 0:
+        return [], 0, True
+
+    fin_debut = np.array(fin_debut, dtype=float)
+    np.fill_diagonal(fin_debut, np.inf)
+    entree_min = np.minimum(depart, fin_debut.min(axis=0)) if n > 1 else np.asarray(depart, dtype=float)
+    borne_tache = (couts + entree_min).tolist()
+    transition = (fin_debut + couts[None, :]).tolist()
+    initial = (np.asarray(depart) + couts).tolist()
+
+    # Solution initiale : plus proche voisin
+    ordre_glouton = []
+    restantes = set(range(n))
+    courant = None
+    cout_glouton = 0
+    while restantes:
+        suivante = min(restantes, key=lambda j: initial[j] if courant is None else transition[courant][j])
+        cout_glouton += initial[suivante] if courant is None else transition[courant][suivante]
+        ordre_glouton.append(suivante)
+        restantes.discard(suivante)
+        courant = suivante
+
+    meilleur = {"ordre": ordre_glouton, "cout": cout_glouton}
+    limite = None if time_budget is None else time.perf_counter() + time_budget
+    etat = {"noeuds": 0, "interrompu": False}
+    ordre = []
+    visitees = [False] * n
+
+    def explorer(dernier, cout, borne_restante):
+        etat["noeuds"] += 1
+        if limite is not None and etat["noeuds"] % 256 == 0 and time.perf_counter() > limite:
+            etat["interrompu"] = True
+        if etat["interrompu"]:
+            return
+        if len(ordre) == n:
+            if cout < meilleur["cout"]:
+                meilleur["ordre"] = list(ordre)
+                meilleur["cout"] = cout
+            return
+
+        couts_suivants = initial if dernier is None else transition[dernier]
+        candidats = sorted((couts_suivants[j], j) for j in range(n) if not visitees[j])
+        for pas, j in candidats:
+            nouvelle_borne = borne_restante - borne_tache[j]
+            if cout + pas + nouvelle_borne >= meilleur["cout"]:
+                continue
+            visitees[j] = True
+            ordre.append(j)
+            explorer(j, cout + pas, nouvelle_borne)
+            ordre.pop()
+            visitees[j] = False
+            if etat["interrompu"]:
+                return
+
+    explorer(None, 0, sum(borne_tache))
+    return meilleur["ordre"], float(meilleur["cout"]), not etat["interrompu"]
+
+
+def branch_and_bound_task_order(tasks, start_position, time_budget=None):
+    """Ordre des tâches par branch-and-bound, renvoyé comme (ordre, coût, optimal)."""
+    if not tasks:
+        return [], 0, True
+    depart, fin_debut, couts = matrices_route(tasks, start_position)
+    ordre, min_cost, optimal = branch_and_bound(depart, fin_debut, couts, time_budget=time_budget)
+    return [tasks[i] for i in ordre], min_cost, optimal
+
+
+# -------------------------------
+# Recherche locale (2-opt, Or-opt, échange)
+# -------------------------------
+def _matrice_etendue(depart, fin_debut):
+    """Matrice des arcs avec un nœud 0 pour la position de départ : la tournée devient un circuit 0 -> ... -> 0
+    dont le dernier arc (retour au départ) est gratuit."""
+    n = len(depart)
+    arcs = np.zeros((n + 1, n + 1))
+    arcs[0, 1:] = depart
+    arcs[1:, 1:] = fin_debut
+    return arcs
+
+
+def recherche_locale(ordre, depart, fin_debut, couts, max_iterations=1000, time_limit=None):
+    """Améliorer un ordre de tâches par 2-opt, Or-opt (déplacement de 1 à 3 tâches) et échange de deux tâches.
+
+    Le coût fin -> début étant asymétrique, le gain d'un 2-opt (inversion d'un segment) se calcule en O(1) grâce
+    aux sommes cumulées des arcs dans les deux sens. Tous les gains d'un voisinage sont évalués d'un coup avec
+    NumPy, puis le meilleur mouvement améliorant est appliqué, jusqu'à max_iterations mouvements ou time_limit
+    secondes. Renvoie (ordre, coût).
+    """
+    n = len(ordre)
+    if n < 2:
+        return list(ordre), cout_ordre(list(ordre), depart, fin_debut, couts)
+
+    arcs = _matrice_etendue(depart, fin_debut)
+    limite = None if time_limit is None else time.perf_counter() + time_limit
+    seq = np.concatenate([[0], np.asarray(ordre) + 1, [0]])
+    positions = np.arange(1, n + 1)
+
+    for _ in range(max_iterations):
+        if limite is not None and time.perf_counter() > limite:
+            break
+        arc = arcs[seq[:-1], seq[1:]]        # arc[t] : seq[t] -> seq[t + 1]
+        arc_inverse = arcs[seq[1:], seq[:-1]]
+        avant = np.concatenate([[0], np.cumsum(arc)])
+        arriere = np.concatenate([[0], np.cumsum(arc_inverse)])
+        meilleur = (-1e-9, None)
+
+        # 2-opt : inversion du segment seq[i..j]
+        i, j = positions[:, None], positions[None, :]
+        gain = (
+            arcs[seq[i - 1], seq[j]] + arcs[seq[i], seq[j + 1]] - arc[i - 1] - arc[j]
+            + (arriere[j] - arriere[i]) - (avant[j] - avant[i])
+        )
+        gain = np.where(j > i, gain, np.inf)
+        k = np.argmin(gain)
+        if gain.flat[k] < meilleur[0]:
+            meilleur = (gain.flat[k], ("2-opt", k // n + 1, k % n + 1))
+
+        # Or-opt : déplacement du segment seq[i..i+L-1] entre seq[p] et seq[p + 1]
+        for longueur in (1, 2, 3):
+            if longueur >= n:
+                break
+            i = np.arange(1, n - longueur + 2)[:, None]
+            p = np.arange(0, n + 1)[None, :]
+            fin = i + longueur - 1
+            gain = (
+                arcs[seq[i - 1], seq[fin + 1]] - arc[i - 1] - arc[fin]
+                + arcs[seq[p], seq[i]] + arcs[seq[fin], seq[p + 1]] - arc[p]
+            )
+            gain = np.where((p < i - 1) | (p > fin), gain, np.inf)
+            k = np.argmin(gain)
+            if gain.flat[k] < meilleur[0]:
+                meilleur = (gain.flat[k], ("or-opt", int(i.flat[k // (n + 1)]), k % (n + 1), longueur))
+
+        # Échange de deux tâches non adjacentes (les voisines sont couvertes par le 2-opt)
+        i, j = positions[:, None], positions[None, :]
+        gain = (
+            arcs[seq[i - 1], seq[j]] + arcs[seq[j], seq[i + 1]] + arcs[seq[j - 1], seq[i]] + arcs[seq[i], seq[j + 1]]
+            - arc[i - 1] - arc[i] - arc[j - 1] - arc[j]
+        )
+        gain = np.where(j > i + 1, gain, np.inf)
+        k = np.argmin(gain)
+        if gain.flat[k] < meilleur[0]:
+            meilleur = (gain.flat[k], ("swap", k // n + 1, k % n + 1))
+
+        mouvement = meilleur[1]
+        if mouvement is None:
+            break
+        interieur = seq[1:-1].tolist()
+        if mouvement[0] == "2-opt":
+            _, i, j = mouvement
+            interieur[i - 1:j] = interieur[i - 1:j][::-1]
+        elif mouvement[0] == "swap":
+            _, i, j = mouvement
+            interieur[i - 1], interieur[j - 1] = interieur[j - 1], interieur[i - 1]
+        else:
+            _, i, p, longueur = mouvement
+            segment = interieur[i - 1:i - 1 + longueur]
+            reste = interieur[:i - 1] + interieur[i - 1 + longueur:]
+            # p est une position dans la séquence complète : on la ramène dans la liste sans le segment
+            insertion = p if p < i else p - longueur
+            interieur = reste[:insertion] + segment + reste[insertion:]
+        seq = np.concatenate([[0], interieur, [0]])
+
+    nouvel_ordre = (seq[1:-1] - 1).tolist()
+    return nouvel_ordre, cout_ordre(nouvel_ordre, depart, fin_debut, couts)
+
+
+# -------------------------------
+# Christofides sur le coût asymétrique
+# -------------------------------
+def _arbre_couvrant_minimal(poids):
+    """Arbre couvrant minimal (Prim en O(n²) sur une matrice dense), renvoyé comme liste d'arêtes."""
+    n = len(poids)
+    dans_arbre = np.zeros(n, dtype=bool)
+    dans_arbre[0] = True
+    meilleur = poids[0].copy()
+    parent = np.zeros(n, dtype=np.int64)
+    aretes = []
+    for _ in range(n - 1):
+        candidats = np.where(dans_arbre, np.inf, meilleur)
+        v = int(np.argmin(candidats))
+        aretes.append((int(parent[v]), v))
+        dans_arbre[v] = True
+        plus_proche = poids[v] < meilleur
+        meilleur = np.where(plus_proche, poids[v], meilleur)
+        parent[plus_proche] = v
+    return aretes
+
+
+def _couplage(sommets, poids, matching):
+    """Couplage parfait des sommets de degré impair : glouton par poids croissant, ou exact avec networkx."""
+    if matching == "exact":
+        import networkx as nx  # Seulement pour le couplage exact (plus lent)
+
+        graphe = nx.Graph()
+        graphe.add_weighted_edges_from(
+            (a, b, poids[a, b]) for k, a in enumerate(sommets) for b in sommets[k + 1:]
+        )
+        return list(nx.algorithms.matching.min_weight_matching(graphe, weight="weight"))
+
+    sommets = np.asarray(sommets)
+    a, b = np.triu_indices(len(sommets), 1)
+    ordre = np.argsort(poids[sommets[a], sommets[b]], kind="stable")
+    libre = np.ones(len(sommets), dtype=bool)
+    couples = []
+    for k in ordre:
+        if libre[a[k]] and libre[b[k]]:
+            libre[a[k]] = libre[b[k]] = False
+            couples.append((int(sommets[a[k]]), int(sommets[b[k]])))
+    return couples
+
+
+def _circuit_eulerien(n, aretes, depart=0):
+    """Circuit eulérien (Hierholzer) d'un multigraphe connexe dont tous les degrés sont pairs."""
+    voisins = [[] for _ in range(n)]
+    for k, (a, b) in enumerate(aretes):
+        voisins[a].append((b, k))
+        voisins[b].append((a, k))
+    utilisee = [False] * len(aretes)
+    pile, circuit = [depart], []
+    while pile:
+        v = pile[-1]
+        while voisins[v] and utilisee[voisins[v][-1][1]]:
+            voisins[v].pop()
+        if voisins[v]:
+            w, k = voisins[v].pop()
+            utilisee[k] = True
+            pile.append(w)
+        else:
+            circuit.append(pile.pop())
+    return circuit[::-1]
+
+
+def christofides(depart, fin_debut, couts, matching="greedy"):
+    """Ordre des tâches inspiré de Christofides, sur un modèle de coût asymétrique avec un nœud de départ.
+
+    Le nœud 0 représente start_position et les nœuds 1..n les tâches ; l'arc i -> j coûte fin_debut[i, j], l'arc
+    0 -> j coûte depart[j], et le retour vers 0 est gratuit. Le graphe est symétrisé (moyenne des deux sens)
+    pour construire l'arbre couvrant, le couplage des sommets impairs et le circuit eulérien ; le circuit
+    raccourci est ensuite parcouru dans le sens le moins cher pour le coût réel. Renvoie (ordre, coût).
+
+    Aucune garantie d'approximation par défaut : le couplage glouton (matching="greedy") n'est pas un couplage
+    parfait de poids minimal. La borne 3/2 de Christofides demande matching="exact" et l'inégalité triangulaire
+    sur les poids symétrisés (qui n'est pas assurée ici), et ne porte alors que sur le circuit symétrisé.
+    """
+    n = len(couts)
+    if n <= 2:
+        candidats = [list(range(n))] + ([[1, 0]] if n == 2 else [])
+        ordre = min(candidats, key=lambda o: cout_ordre(o, depart, fin_debut, couts))
+        return ordre, cout_ordre(ordre, depart, fin_debut, couts)
+
+    arcs = _matrice_etendue(depart, fin_debut)
+    poids = (arcs + arcs.T) / 2
+    np.fill_diagonal(poids, np.inf)
+
+    aretes = _arbre_couvrant_minimal(poids)
+    degres = np.bincount(np.array(aretes).ravel(), minlength=n + 1)
+    impairs = np.flatnonzero(degres % 2 == 1).tolist()
+    aretes += _couplage(impairs, poids, matching)
+
+    # Circuit hamiltonien par raccourcis, en partant du nœud de départ
+    vus = set()
+    circuit = []
+    for v in _circuit_eulerien(n + 1, aretes):
+        if v not in vus:
+            vus.add(v)
+            circuit.append(v)
+    taches = [v - 1 for v in circuit[1:]]
+
+    # Le circuit peut être parcouru dans les deux sens ; le coût réel est asymétrique
+    ordre = min((taches, taches[::-1]), key=lambda o: cout_ordre(o, depart, fin_debut, couts))
+    return ordre, cout_ordre(ordre, depart, fin_debut, couts)
+
+
+# -------------------------------
+# Cache des sous-tournées optimales
+# -------------------------------
+class CacheTournees:
+    """Cache LRU des tables de Held-Karp, indexé par (position de départ, ensemble des indices des tâches).
+
+    Chaque entrée contient l'ordre des tâches dans la table (indices) et la table des coûts optimaux de toutes les
+    sous-tournées. La taille totale des tables est bornée par max_bytes : au-delà, les entrées les moins récemment
+    utilisées sont évincées. Les entrées qui partent d'une position quittée par un taxi, ou qui contiennent une tâche
+    terminée, sont retirées par discard_start et discard_task.
+
+    Pour les plans de moins de min_tasks tâches, Held-Karp complet est plus rapide que l'extension d'une table.
+    """
+
+    def __init__(self, max_bytes=64 * 2 ** 20, min_tasks=8):
+        self.max_bytes = max_bytes
+        self.min_tasks = min_tasks
+        self.nbytes = 0
+        self.entries = OrderedDict()  # (départ, frozenset d'indices) -> (ordre, table), du moins au plus récent
+        self.by_start = {}  # départ -> clés
+        self.by_task = {}   # indice de tâche -> clés
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, start, indices):
+        """(ordre, table) mémorisés pour ce départ et ces tâches, ou None."""
+        key = (tuple(start), frozenset(indices))
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, start, ordre, table):
+        """Mémoriser la table des sous-tournées des tâches ordre (indices, dans l'ordre des colonnes) depuis start."""
+        if table.nbytes > self.max_bytes:
+            return
+        key = (tuple(start), frozenset(ordre))
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = (tuple(ordre), table)
+        self.nbytes += table.nbytes
+        self.by_start.setdefault(key[0], set()).add(key)
+        for index in key[1]:
+            self.by_task.setdefault(index, set()).add(key)
+        while self.nbytes > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+
+    def _remove(self, key):
+        _, table = self.entries.pop(key)
+        self.nbytes -= table.nbytes
+        self._unlink(self.by_start, key[0], key)
+        for index in key[1]:
+            self._unlink(self.by_task, index, key)
+
+    @staticmethod
+    def _unlink(index, name, key):
+        keys = index.get(name)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[name]
+
+    def discard_start(self, start):
+        """Oublier les tables partant de start (un taxi vient de quitter cette position)."""
+        for key in list(self.by_start.get(tuple(start), ())):
+            self._remove(key)
+
+    def discard_task(self, index):
+        """Oublier les tables contenant la tâche d'indice index (terminée)."""
+        for key in list(self.by_task.get(index, ())):
+            self._remove(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.by_start.clear()
+        self.by_task.clear()
+        self.nbytes = 0
@@ -1,8 +1,7 @@
 import random
 import math
-import pygame
 import sys
-import itertools
+from ordonnancement_cocoma import held_karp_task_order
 
 # -------------------------------
 # Classes principales
@@ -150,36 +149,8 @@ class Environment:
 
     # Ordonancement des tâches
     def optimize_task_order(self, tasks, start_position):
-        """Trouver l'ordre optimal des tâches pour minimiser le coût."""
-        min_cost = float('inf')
-        best_order = []
-
-        #print("\nOptimizing task order:")
-        #print(f"Initial tasks: {tasks}")
-        #print(f"Start position: {start_position}")
-
-        for permutation in itertools.permutations(tasks):
-            current_position = start_position
-            total_cost = 0
-
-            #print(f"\nTesting permutation: {permutation}")
-            for task in permutation:
-                distance_to_start = self.calculate_distance(current_position, task.start)
-                distance_to_end = self.calculate_distance(task.start, task.end)
-                total_cost += distance_to_start + distance_to_end
-                current_position = task.end
-                #print(f"  Moving to {task.start}: +{distance_to_start:.2f}")
-                #print(f"  Completing task to {task.end}: +{distance_to_end:.2f}")
-
-            #print(f"  Total cost for this permutation: {total_cost:.2f}")
-
-            if total_cost < min_cost:
-                min_cost = total_cost
-                best_order = list(permutation)
-                #print(f"  New best order found with cost {min_cost:.2f}")
-
-        #print(f"\nBest order: {best_order} with minimum cost: {min_cost:.2f}")
-        return best_order, min_cost
+        """Trouver l'ordre optimal des tâches pour minimiser le coût (Held-Karp, O(2^n·n²))."""
+        return held_karp_task_order(tasks, start_position)
 
     
     def calculate_distance(self, pos1, pos2):
@@ -189,6 +160,8 @@ class Environment:
 # Visualisation avec Pygame
 # -------------------------------
 def visualize_with_pygame(env, allocation_method=0):
+    import pygame  # Importé uniquement pour l'affichage
+
     pygame.init()
     
     # Configuration de l'affichage
@@ -1,86 +1,120 @@
-from partie1_cocoma import *
-
-def generate_file_yaml(env,nom_fic):
-    list_taxis_env=env.taxis
-    list_taches_env=env.tasks
-    list_taxi=[]
-    list_taches=[]
-    for i in range(1,len(list_taxis_env)+1):
-        list_taxi.append(f"taxi_{i}")
-    
-    for i in range(1,len(list_taches_env)+1):
-        list_taches.append(f"task_{i}")
-        
-    with open(nom_fic,"w") as f:
-        f.write("name: Taxi Task Allocation Problem \n")
-        f.write("objective: min \n")
-        f.write("\n")
-
-        #Ecriture des domaines dans le fichier yaml
-        f.write("domains: \n")
-        f.write("   taxis: \n" )
-        f.write("      values: ")
-        f.write("[")
-        for i in range(len(list_taxi)):
-            f.write(list_taxi[i])
-            if i<len(list_taxi)-1:
-                f.write(",")
-        f.write("]\n")
-        f.write("\n")
-
-        #Ecriture des variables dans le fichier yaml
-        f.write("variables: \n")
-        for tache in list_taches:
-            f.write("   ")
-            f.write(tache)
-            f.write(" : \n")
-            f.write("      domain: taxis \n")
-        f.write("\n")
-
-        f.write("constraints: \n")
-        for i in range(len(list_taches)):
-            f.write(f"   pref_{i+1}: \n")
-            f.write("      type: extensional \n")
-            f.write(f"      variables: {list_taches[i]} \n")
-            f.write("      values: \n")
-            for j in range(len(list_taxi)):
-                f.write(f"         {j+1}: {list_taxi[j]} \n")
-            f.write("\n")
-        
-        for i in range(len(list_taches)):
-            for j in range(len(list_taches)):
-                if i<j:
-                    f.write(f"   different_{list_taches[i]}_{list_taches[j]}: \n")
-                    f.write("      type: intention \n")
-                    cout=list_taches_env[i].calculate_distance(list_taches_env[i].end,list_taches_env[j].start)
-                    f.write(f"      function: {cout} if {list_taches[i]}=={list_taches[j]} else 0 \n")
-                    f.write("\n")
-        
-        for i in range(len(list_taxi)):
-            f.write(f"   cout_{list_taxi[i]}: \n")
-            f.write("      type: intention \n")
-            f.write(f"      function: {list_taches_env[0].cost+list_taxis_env[i].calculate_distance(list_taxis_env[i].position,list_taches_env[0].start)} if {list_taches[0]}=='{list_taxi[i]}'")
-            for j in range(1,len(list_taches)-1):
-                f.write(f" else {list_taches_env[j].cost+list_taxis_env[i].calculate_distance(list_taxis_env[i].position,list_taches_env[j].start)} if {list_taches[j]}=='{list_taxi[i]}'")
-            if len(list_taches)>1:
-                f.write(f" else {list_taches_env[-1].cost+list_taxis_env[i].calculate_distance(list_taxis_env[i].position,list_taches_env[-1].start)}")
-            f.write("\n")
-        
-        f.write("\n")
-        f.write(f"agents: \n")
-        for i in range(len(list_taches)):
-            f.write(f"   {list_taches[i]}: \n")
-            f.write("      capacity: 1 \n")
-            
-
-
-GRID_SIZE = 20
-NUM_TAXIS = 3
-TASK_FREQUENCY = 5
-NUM_ITERATIONS = 30
-DELAY = 500  # Délai de 500 millisecondes (0.5 seconde) entre chaque itération
-TASK_NUMBER = 6 # Nombre de tâches à générer, >= NUM_TAXIS
-
-env=Environment(grid_size=GRID_SIZE, num_taxis=NUM_TAXIS, task_frequency=TASK_FREQUENCY, task_number=TASK_NUMBER,num_iterations=NUM_ITERATIONS, delay=DELAY)
-env.generate_tasks()
-generate_file_yaml(env,"freq.yaml")
\ No newline at end of file
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from modele_cocoma import Environment, Task
+from dcop_cocoma import iter_instances
+
+def yaml_document(env, extensional=False):
+    """Texte du fichier YAML du DCOP des tâches en attente de env, construit en mémoire.
+
+    Les contraintes different_*_* sont écrites en intention (« cout if task_i==task_j else 0 »), ou avec
+    extensional=True en tables compactes (une ligne de valeurs, 0 par défaut), plus rapides à lire et à évaluer
+    par pydcop. Les contraintes cout_taxi_* restent en intention : leur enchaînement de conditions porte sur toutes
+    les tâches et n'a pas de table compacte équivalente.
+    """
+    list_taxi = [f"taxi_{i}" for i in range(1, len(env.taxis) + 1)]
+    list_taches = [f"task_{i}" for i in range(1, len(env.tasks) + 1)]
+    tasks = env.tasks
+
+    lines = ["name: Taxi Task Allocation Problem ", "objective: min ", ""]
+
+    # Domaines et variables
+    lines += ["domains: ", "   taxis: ", f"      values: [{','.join(list_taxi)}]", ""]
+    lines.append("variables: ")
+    for tache in list_taches:
+        lines += [f"   {tache} : ", "      domain: taxis "]
+    lines.append("")
+
+    lines.append("constraints: ")
+    for i, tache in enumerate(list_taches):
+        lines += [f"   pref_{i+1}: ", "      type: extensional ", f"      variables: {tache} ", "      values: "]
+        lines += [f"         {j+1}: {taxi} " for j, taxi in enumerate(list_taxi)]
+        lines.append("")
+
+    identiques = " | ".join(f"{taxi} {taxi}" for taxi in list_taxi)
+    for i in range(len(list_taches)):
+        for j in range(i + 1, len(list_taches)):
+            cout = tasks[i].calculate_distance(tasks[i].end, tasks[j].start)
+            lines.append(f"   different_{list_taches[i]}_{list_taches[j]}: ")
+            if extensional:
+                lines += ["      type: extensional ", f"      variables: [{list_taches[i]}, {list_taches[j]}] ",
+                          "      default: 0 ", "      values: ", f"         {cout}: {identiques} "]
+            else:
+                lines += ["      type: intention ", f"      function: {cout} if {list_taches[i]}=={list_taches[j]} else 0 "]
+            lines.append("")
+
+    for taxi, taxi_env in zip(list_taxi, env.taxis):
+        couts = [task.cost + taxi_env.calculate_distance(taxi_env.position, task.start) for task in tasks]
+        function = f"{couts[0]} if {list_taches[0]}=='{taxi}'"
+        function += "".join(f" else {couts[j]} if {list_taches[j]}=='{taxi}'" for j in range(1, len(list_taches) - 1))
+        if len(list_taches) > 1:
+            function += f" else {couts[-1]}"
+        lines += [f"   cout_{taxi}: ", "      type: intention ", f"      function: {function}"]
+
+    lines += ["", "agents: "]
+    for tache in list_taches:
+        lines += [f"   {tache}: ", "      capacity: 1 "]
+    return "\n".join(lines) + "\n"
+
+
+def generate_file_yaml(env, nom_fic, extensional=False):
+    """Écrire le fichier YAML du DCOP des tâches en attente de env, en une seule écriture."""
+    with open(nom_fic, "w") as f:
+        f.write(yaml_document(env, extensional))
+
+
+# -------------------------------
+# Génération d'instances en parallèle
+# -------------------------------
+def _generate_simulation(arguments):
+    output_dir, sim, task_number, seed, extensional = arguments
+    for time_step, env in iter_instances(sim, task_number, seed):
+        generate_file_yaml(env, os.path.join(output_dir, f"inst_{sim}_{time_step}.yaml"), extensional)
+
+
+def generate_files(output_dir, nb_simulation, task_number=3, seed=0, extensional=True, max_workers=None):
+    """Générer les instances inst_<simulation>_<temps>.yaml de nb_simulation simulations (graines dérivées de
+    seed) dans output_dir, réparties sur un pool de processus (max_workers=1 pour une exécution séquentielle).
+
+    Les instances sont celles que dcop_cocoma.resolve_instances résout avec la même graine.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    arguments = [(output_dir, sim, task_number, seed, extensional) for sim in range(1, nb_simulation + 1)]
+    if max_workers == 1:
+        for argument in arguments:
+            _generate_simulation(argument)
+        return
+    workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(_generate_simulation, arguments, chunksize=max(1, len(arguments) // (4 * workers))))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fichiers YAML du DCOP d'allocation : freq.yaml, ou un lot d'instances.")
+    parser.add_argument("--output-dir", help="répertoire du lot d'instances, par exemple fichiers_3_taxis_3_taches")
+    parser.add_argument("--nb-simulation", type=int, default=10)
+    parser.add_argument("--task-number", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--intention", action="store_true", help="contraintes different_*_* en intention")
+    parser.add_argument("--workers", type=int, default=None, help="nombre de processus (tous les cœurs par défaut)")
+    args = parser.parse_args()
+
+    if args.output_dir:
+        start = time.perf_counter()
+        generate_files(args.output_dir, args.nb_simulation, args.task_number, args.seed,
+                       extensional=not args.intention, max_workers=args.workers)
+        print(f"{args.nb_simulation} simulations générées en {time.perf_counter() - start:.2f} s")
+        raise SystemExit
+
+    GRID_SIZE = 20
+    NUM_TAXIS = 3
+    TASK_FREQUENCY = 5
+    NUM_ITERATIONS = 30
+    DELAY = 500  # Délai de 500 millisecondes (0.5 seconde) entre chaque itération
+    TASK_NUMBER = 6 # Nombre de tâches à générer, >= NUM_TAXIS
+
+    env=Environment(grid_size=GRID_SIZE, num_taxis=NUM_TAXIS, task_frequency=TASK_FREQUENCY, task_number=TASK_NUMBER,num_iterations=NUM_ITERATIONS, delay=DELAY)
+    env.generate_tasks()
+    generate_file_yaml(env,"freq.yaml")
@@ -0,0 +1,126 @@
+import argparse
+import glob
+import os
+import re
+import shlex
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Commande de résolution : {algorithm} et {yaml} sont remplacés pour chaque instance
+DEFAULT_COMMAND = "pydcop solve -a {algorithm} {yaml}"
+INSTANCE_NAME = re.compile(r"inst_(\d+)_(\d+)\.ya?ml$")
+
+
+# -------------------------------
+# Instances et fichiers de résultats
+# -------------------------------
+def find_instances(patterns):
+    """Fichiers YAML désignés par des répertoires (tous leurs *.yaml) ou des motifs glob, triés et sans doublon."""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.update(glob.glob(os.path.join(pattern, "*.yaml")) + glob.glob(os.path.join(pattern, "*.yml")))
+        else:
+            paths.update(glob.glob(pattern))
+    return sorted(paths)
+
+
+def result_path(yaml_path, output_root):
+    """Fichier de résultat d'une instance : output_root/inst_<i>/result_<temps> pour inst_<i>_<temps>.yaml (disposition
+    lue par lire_donnes), output_root/<nom> sinon."""
+    match = INSTANCE_NAME.search(os.path.basename(yaml_path))
+    if match:
+        return os.path.join(output_root, f"inst_{match.group(1)}", f"result_{match.group(2)}")
+    return os.path.join(output_root, os.path.splitext(os.path.basename(yaml_path))[0])
+
+
+def make_jobs(patterns, output_root, algorithm="dpop", resume=False):
+    """Travaux (instance, résultat) à lancer ; avec resume, les instances dont le résultat existe déjà sont omises."""
+    jobs = []
+    for yaml_path in find_instances(patterns):
+        output = result_path(yaml_path, output_root)
+        if resume and os.path.exists(output) and os.path.getsize(output) > 0:
+            continue
+        jobs.append({"yaml": yaml_path, "output": output, "algorithm": algorithm})
+    return jobs
+
+
+# -------------------------------
+# Exécution
+# -------------------------------
+def run_job(job, command=DEFAULT_COMMAND, timeout=None, retries=0):
+    """Lancer la résolution d'une instance et écrire sa sortie standard dans le fichier de résultat.
+
+    Le résultat est écrit dans un fichier temporaire puis renommé : un résultat interrompu n'est jamais pris pour
+    un résultat terminé par le mode resume. En cas d'échec (code de retour non nul ou dépassement du délai), la
+    commande est relancée jusqu'à retries fois, et la dernière erreur est écrite dans <résultat>.err.
+    """
+    argv = [part.format(algorithm=job["algorithm"], yaml=job["yaml"]) for part in shlex.split(command)]
+    os.makedirs(os.path.dirname(job["output"]) or ".", exist_ok=True)
+    status = dict(job, attempts=0, returncode=None, error=None)
+
+    start = time.perf_counter()
+    for attempt in range(retries + 1):
+        status["attempts"] = attempt + 1
+        try:
+            completed = subprocess.run(argv, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            status.update(returncode=None, error=f"délai de {timeout} s dépassé")
+            continue
+        except OSError as error:
+            status.update(returncode=None, error=str(error))
+            break  # Commande introuvable : inutile de réessayer
+        status["returncode"] = completed.returncode
+        if completed.returncode == 0:
+            temporary = job["output"] + ".tmp"
+            with open(temporary, "w") as f:
+                f.write(completed.stdout)
+            os.replace(temporary, job["output"])
+            status["error"] = None
+            break
+        status["error"] = completed.stderr.strip() or f"code de retour {completed.returncode}"
+
+    status["time"] = time.perf_counter() - start
+    if status["error"] is not None:
+        with open(job["output"] + ".err", "w") as f:
+            f.write(status["error"] + "\n")
+    elif os.path.exists(job["output"] + ".err"):
+        os.remove(job["output"] + ".err")  # Erreur d'une exécution précédente
+    return status
+
+
+def run_batch(jobs, command=DEFAULT_COMMAND, max_workers=None, timeout=None, retries=0):
+    """Lancer les travaux sur un pool borné (un processus de résolution par cœur par défaut).
+
+    Les statuts sont renvoyés dans l'ordre des travaux.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda job: run_job(job, command, timeout, retries), jobs))
+
+
+# -------------------------------
+# Main Program
+# -------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Résolution pydcop en parallèle d'un lot d'instances YAML.")
+    parser.add_argument("instances", nargs="+", help="répertoires d'instances ou motifs glob (guillemets)")
+    parser.add_argument("-o", "--output-root", required=True, help="répertoire des résultats")
+    parser.add_argument("-a", "--algorithm", default="dpop")
+    parser.add_argument("--command", default=DEFAULT_COMMAND,
+                        help="commande de résolution, avec {algorithm} et {yaml} (défaut : %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="résolutions simultanées (tous les cœurs par défaut)")
+    parser.add_argument("--timeout", type=float, default=None, help="délai maximal d'une résolution, en secondes")
+    parser.add_argument("--retries", type=int, default=0, help="nouvelles tentatives après un échec")
+    parser.add_argument("--resume", action="store_true", help="ne pas relancer les instances déjà résolues")
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.instances, args.output_root, args.algorithm, args.resume)
+    start = time.perf_counter()
+    statuses = run_batch(jobs, args.command, args.workers, args.timeout, args.retries)
+    failed = [status for status in statuses if status["error"] is not None]
+    print(f"{len(statuses) - len(failed)} instances résolues, {len(failed)} échecs, "
+          f"en {time.perf_counter() - start:.2f} s")
+    for status in failed:
+        print(f"  {status['yaml']} : {status['error'].splitlines()[-1]}")
@@ -0,0 +1,210 @@
+import argparse
+import csv
+import glob
+import json
+import logging
+import os
+import re
+import sqlite3
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Colonnes de la table des résultats : texte, entiers (-1 si absent) et réels (NaN si absent)
+TEXT_COLUMNS = ("source", "run", "method")
+INTEGER_COLUMNS = ("grid_size", "num_taxis", "task_number", "seed", "time_step")
+REAL_COLUMNS = ("cost", "time")
+COLUMNS = TEXT_COLUMNS + INTEGER_COLUMNS + REAL_COLUMNS
+
+RESULTS_DIR_NAME = re.compile(r"results_(?P<method>.+)_(?P<num_taxis>\d+)_taxis_(?P<task_number>\d+)_taches$")
+RESULT_FILE_NAME = re.compile(r"result_(\d+)$")
+
+
+# -------------------------------
+# Stockage (SQLite, ajout seulement)
+# -------------------------------
+class ResultStore:
+    """Table unique des résultats de toutes les sources (pydcop, tournoi, benchmarks) dans un fichier SQLite.
+
+    Les lignes sont seulement ajoutées ; columns() relit une sélection sous forme de colonnes NumPy.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        definitions = [f"{name} TEXT" for name in TEXT_COLUMNS] + [f"{name} INTEGER" for name in INTEGER_COLUMNS]
+        definitions += [f"{name} REAL" for name in REAL_COLUMNS]
+        self.connection.execute(f"CREATE TABLE IF NOT EXISTS results ({', '.join(definitions)})")
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def append(self, rows):
+        """Ajouter des lignes (dictionnaires, colonnes absentes à NULL) en une transaction ; renvoie leur nombre."""
+        placeholders = ", ".join("?" * len(COLUMNS))
+        with self.connection:
+            cursor = self.connection.executemany(
+                f"INSERT INTO results ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                (tuple(row.get(name) for name in COLUMNS) for row in rows),
+            )
+        return cursor.rowcount
+
+    def columns(self, where=None, parameters=()):
+        """Colonnes NumPy des lignes sélectionnées (clause SQL where facultative)."""
+        query = f"SELECT {', '.join(COLUMNS)} FROM results" + (f" WHERE {where}" if where else "")
+        rows = self.connection.execute(query, parameters).fetchall()
+        values = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+        columns = {}
+        for name, column in zip(COLUMNS, values):
+            if name in TEXT_COLUMNS:
+                columns[name] = np.array(["" if value is None else value for value in column], dtype=str)
+            elif name in INTEGER_COLUMNS:
+                columns[name] = np.array([-1 if value is None else value for value in column], dtype=np.int64)
+            else:
+                columns[name] = np.array([np.nan if value is None else value for value in column], dtype=float)
+        return columns
+
+    def close(self):
+        self.connection.close()
+
+
+# -------------------------------
+# Lecture des sources
+# -------------------------------
+def pydcop_rows(results_dir, method=None):
+    """Lignes des résultats JSON de pydcop solve (ou de dcop_cocoma) rangés en results_dir/inst_<i>/result_<temps>.
+
+    La méthode, le nombre de taxis et le nombre de tâches sont lus dans le nom du répertoire
+    (results_<méthode>_<taxis>_taxis_<tâches>_taches) ; les fichiers illisibles sont ignorés.
+    """
+    run = os.path.basename(os.path.normpath(results_dir))
+    match = RESULTS_DIR_NAME.match(run)
+    config = match.groupdict() if match else {"method": run}
+    base = {"source": "pydcop", "run": run, "method": method or config["method"],
+            "num_taxis": int(config["num_taxis"]) if match else None,
+            "task_number": int(config["task_number"]) if match else None}
+
+    for instance_folder in sorted(glob.glob(os.path.join(results_dir, "inst_*"))):
+        seed = int(instance_folder.rsplit("_", 1)[1])
+        for path in sorted(os.listdir(instance_folder)):
+            name = RESULT_FILE_NAME.match(path)
+            if not name:
+                continue
+            try:
+                with open(os.path.join(instance_folder, path)) as f:
+                    content = json.load(f)
+            except (OSError, ValueError):
+                logger.warning("Résultat illisible ignoré : %s", os.path.join(instance_folder, path))
+                continue
+            yield dict(base, seed=seed, time_step=int(name.group(1)), cost=content.get("cost"), time=content.get("time"))
+
+
+def tournament_rows(rows, run="tournoi"):
+    """Lignes des cellules du tournoi (run_tournament ou CSV de write_csv)."""
+    from tournoi_cocoma import ALLOCATION_NAMES, ORDONANCEMENT_NAMES
+
+    for row in rows:
+        allocation, ordonancement = int(row["allocation_method"]), int(row["ordonancement_method"])
+        yield {
+            "source": "tournoi", "run": run,
+            "method": f"{ALLOCATION_NAMES.get(allocation, allocation)} / {ORDONANCEMENT_NAMES.get(ordonancement, ordonancement)}",
+            "grid_size": int(row["grid_size"]), "num_taxis": int(row["num_taxis"]),
+            "task_number": int(row["task_number"]), "seed": int(row["seed"]),
+            "cost": float(row["cost"]), "time": float(row["wall_time"]),
+        }
+
+
+def benchmark_rows(path):
+    """Lignes d'un fichier JSON de benchmarks/bench_cocoma.py (médiane des durées, sans coût)."""
+    with open(path) as f:
+        data = json.load(f)
+    for bench in data["benchmarks"]:
+        yield {"source": "benchmark", "run": data.get("commit"), "method": bench["name"],
+               "num_taxis": bench["params"].get("taxis"), "task_number": bench["params"].get("tasks"),
+               "time": bench["median"]}
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+# -------------------------------
+# Agrégation vectorisée
+# -------------------------------
+def aggregate(columns, keys, values=("cost", "time"), percentiles=(50, 95)):
+    """Statistiques par configuration (combinaison des colonnes keys) : effectif, moyenne, écart-type et centiles
+    de chaque colonne de values, les valeurs absentes (NaN) étant ignorées.
+
+    Renvoie un dictionnaire de colonnes : une valeur de chaque clé par groupe, puis count, <valeur>_mean,
+    <valeur>_std et <valeur>_p<centile>.
+    """
+    if len(columns[values[0]]) == 0:
+        return dict({key: columns[key][:0] for key in keys}, count=np.zeros(0, dtype=np.int64))
+    codes = np.stack([np.unique(columns[key], return_inverse=True)[1].ravel() for key in keys], axis=1)
+    groups, first, group = np.unique(codes, axis=0, return_index=True, return_inverse=True)
+    group = group.ravel()
+    num_groups = len(groups)
+
+    result = {key: columns[key][first] for key in keys}
+    result["count"] = np.bincount(group, minlength=num_groups)
+    for name in values:
+        x = columns[name]
+        valid = ~np.isnan(x)
+        g, x = group[valid], x[valid]
+        count = np.bincount(g, minlength=num_groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.bincount(g, weights=x, minlength=num_groups) / count
+            variance = np.bincount(g, weights=x * x, minlength=num_groups) / count - mean ** 2
+        result[f"{name}_mean"] = mean
+        result[f"{name}_std"] = np.sqrt(np.maximum(variance, 0))
+
+        # Centiles par interpolation linéaire dans chaque groupe trié
+        sorted_x = x[np.lexsort((x, g))]
+        starts = np.concatenate([[0], np.cumsum(count)[:-1]])
+        last = max(len(sorted_x) - 1, 0)
+        for q in percentiles:
+            if len(sorted_x) == 0:
+                result[f"{name}_p{q}"] = np.full(num_groups, np.nan)
+                continue
+            position = starts + q / 100 * np.maximum(count - 1, 0)
+            low = np.minimum(np.floor(position).astype(np.int64), last)
+            high = np.minimum(np.ceil(position).astype(np.int64), last)
+            p = sorted_x[low] + (position - low) * (sorted_x[high] - sorted_x[low])
+            result[f"{name}_p{q}"] = np.where(count > 0, p, np.nan)
+    return result
+
+
+def format_aggregate(result, keys, values=("cost", "time")):
+    """Tableau texte d'un résultat de aggregate."""
+    statistics = [column for column in result if column not in keys]
+    lines = ["  ".join(f"{column:>14}" for column in (*keys, *statistics))]
+    for i in range(len(result["count"])):
+        cells = [f"{result[key][i]:>14}" for key in keys]
+        cells += [f"{result[column][i]:>14.4g}" for column in statistics]
+        lines.append("  ".join(cells))
+    return "\n".join(lines)
+
+
+# -------------------------------
+# Main Program
+# -------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Agrégation des résultats (pydcop, tournoi, benchmarks) dans SQLite.")
+    parser.add_argument("store", help="fichier SQLite des résultats (créé au besoin)")
+    parser.add_argument("--pydcop", nargs="+", default=[], help="répertoires results_<méthode>_<k>_taxis_<n>_taches")
+    parser.add_argument("--tournoi", nargs="+", default=[], help="fichiers CSV de tournoi_cocoma.py --output")
+    parser.add_argument("--benchmark", nargs="+", default=[], help="fichiers JSON de benchmarks/bench_cocoma.py")
+    parser.add_argument("--keys", nargs="+", default=["source", "method", "num_taxis", "task_number"])
+    args = parser.parse_args()
+
+    store = ResultStore(args.store)
+    for results_dir in args.pydcop:
+        print(f"{results_dir} : {store.append(pydcop_rows(results_dir))} lignes")
+    for path in args.tournoi:
+        print(f"{path} : {store.append(tournament_rows(read_csv(path), run=os.path.basename(path)))} lignes")
+    for path in args.benchmark:
+        print(f"{path} : {store.append(benchmark_rows(path))} lignes")
+    print(format_aggregate(aggregate(store.columns(), args.keys), args.keys))
+    store.close()
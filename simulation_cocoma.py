@@ -0,0 +1,374 @@
+import heapq
+import itertools
+import time
+
+
+# -------------------------------
+# Observateurs de la simulation
+# -------------------------------
+class Observer:
+    """Observateur de la simulation : toutes les méthodes sont facultatives et ne font rien par défaut.
+
+    Un observateur peut interrompre la simulation en passant simulator.running à False.
+    """
+
+    def on_start(self, simulator):
+        """Appelé après l'allocation et l'ordonnancement initiaux."""
+
+    def before_step(self, simulator):
+        """Appelé avant chaque pas de temps (par exemple pour attendre l'utilisateur)."""
+
+    def render(self, simulator):
+        """Appelé une fois les tâches allouées et les trajectoires mises à jour, avant le déplacement des taxis."""
+
+    def after_step(self, simulator, metrics):
+        """Appelé à la fin de chaque pas de temps avec les mesures de ce pas."""
+
+    def on_end(self, simulator):
+        """Appelé à la fin de la simulation."""
+
+
+# -------------------------------
+# Simulation sans affichage
+# -------------------------------
+class Simulator:
+    """Boucle de simulation d'un environnement : génération des tâches, allocation, ordonnancement et déplacement
+    des taxis, sans dépendance à l'affichage.
+
+    Chaque pas de temps renvoie un dictionnaire de mesures ; l'affichage éventuel (pygame) est un observateur.
+    """
+
+    def __init__(self, env, allocation_method=0, ordonancement_method=0, local_search=False, observers=()):
+        self.env = env
+        self.allocation_method = allocation_method  # 0 aléatoire, 1 Opti, 2 PSI, 3 SSI, 4 SSI avec regret, 5 Hongroise, 6 DCOP DPOP, 7 DCOP DSA
+        self.ordonancement_method = ordonancement_method  # 0 Greedy, 1 Opti, 2 Christofides
+        self.local_search = local_search
+        self.observers = list(observers)
+        self.time_step = 0
+        self.running = True
+        self.started = False
+        self.start_metrics = {}  # Durées de l'allocation et de l'ordonnancement initiaux
+
+    def add_observer(self, observer):
+        self.observers.append(observer)
+
+    def _notify(self, event, *args):
+        for observer in self.observers:
+            getattr(observer, event)(self, *args)
+
+    def ordering_function(self):
+        """Méthode d'ordonnancement choisie (None si aucune)."""
+        env = self.env
+        if self.ordonancement_method == 0:
+            return env.greedy_task_order
+        if self.ordonancement_method == 1:
+            return env.optimize_task_order
+        if self.ordonancement_method == 2:
+            return env.optimize_task_order_christofides
+        return None
+
+    def order_tasks(self):
+        """Ordonnancer les tâches de chaque taxi avec la méthode choisie."""
+        env = self.env
+        order = self.ordering_function()
+        if order is not None:
+            for taxi in env.taxis:
+                taxi.tasks, taxi.total_cost = order(taxi.tasks, taxi.position)
+
+        if self.local_search:
+            # Post-optimisation de l'ordre obtenu par recherche locale
+            for taxi in env.taxis:
+                taxi.tasks, taxi.total_cost = env.improve_task_order(taxi.tasks, taxi.position)
+
+    def start(self):
+        """Allocation et ordonnancement initiaux."""
+        allocation_start = time.perf_counter()
+        self.env.allocate_tasks(allocation_method=self.allocation_method)
+        ordering_start = time.perf_counter()
+        self.order_tasks()
+        self.start_metrics = {
+            "allocation_time": ordering_start - allocation_start,
+            "ordering_time": time.perf_counter() - ordering_start,
+        }
+        self.started = True
+        self._notify("on_start")
+
+    def step(self):
+        """Avancer la simulation d'un pas de temps et renvoyer les mesures de ce pas."""
+        env = self.env
+        step_start = time.perf_counter()
+
+        generated = 0
+        if self.time_step % env.task_frequency == 0:
+            pending = len(env.tasks)
+            env.generate_tasks()
+            generated = len(env.tasks) - pending
+
+        allocation_start = time.perf_counter()
+        generation_time = allocation_start - step_start
+        allocated = len(env.tasks)
+        if env.tasks:
+            env.allocate_tasks(allocation_method=self.allocation_method)
+        allocated -= len(env.tasks)
+        allocation_time = time.perf_counter() - allocation_start
+
+        for taxi in env.taxis:
+            # Mettre à jour les trajectoires avant l'affichage
+            taxi.update_trajectories(env.time)
+        render_start = time.perf_counter()
+        self._notify("render")
+        render_time = time.perf_counter() - render_start
+
+        execution_start = time.perf_counter()
+        positions = env.fleet.positions.copy()
+        for taxi in env.taxis:
+            taxi.execute_task()
+
+            # Supprimer les lignes terminées après affichage
+            if not taxi.tasks or taxi.current_task_index >= len(taxi.tasks):
+                taxi.reset_finished_trajectory()
+
+        moves = int((env.fleet.positions != positions).any(axis=1).sum())
+        execution_time = time.perf_counter() - execution_start
+
+        env.time += 1
+        self.time_step += 1
+
+        return {
+            "time": env.time,
+            "generated": generated,
+            "allocated": allocated,
+            "pending": len(env.tasks),
+            "moves": moves,
+            "completed": env.fleet.completed(),
+            "total_cost": env.fleet.total_cost(),
+            "generation_time": generation_time,
+            "allocation_time": allocation_time,
+            "execution_time": execution_time,
+            "render_time": render_time,
+            "step_time": time.perf_counter() - step_start,
+        }
+
+    def run(self, num_steps=None):
+        """Dérouler la simulation (env.num_iterations pas par défaut) et renvoyer la liste des mesures par pas."""
+        if num_steps is None:
+            num_steps = self.env.num_iterations
+        if not self.started:
+            self.start()
+
+        history = []
+        last_step = self.time_step + num_steps
+        while self.running and self.time_step < last_step:
+            self._notify("before_step")
+            if not self.running:
+                break
+            metrics = self.step()
+            history.append(metrics)
+            self._notify("after_step", metrics)
+
+        self._notify("on_end")
+        self.env.close()
+        return history
+
+
+# -------------------------------
+# Simulation à événements discrets
+# -------------------------------
+class EventSimulator(Simulator):
+    """Simulation à événements discrets : l'horloge saute d'un événement au suivant au lieu d'avancer d'une unité.
+
+    Les événements (arrivée d'un lot de tâches, point de départ atteint, destination atteinte, enchère) sont rangés
+    dans un tas par date. Un trajet dure sa distance euclidienne divisée par speed ; les lots de tâches arrivent aux
+    dates 0, task_frequency, 2 × task_frequency, ... avant horizon (env.num_iterations par défaut). Les périodes
+    sans événement ne coûtent rien : le tas coûte O(log(événements)) par événement, et une enchère le coût de
+    l'allocation sur les plans en cours. Les tâches livrées sont en effet retirées du plan des taxis
+    (Taxi.archive_completed) et conservées dans completed_tasks, si bien que le coût d'un événement ne croît pas
+    avec la durée simulée.
+
+    Une enchère alloue les tâches en attente après chaque arrivée, puis ordonnance la suite du plan des taxis servis
+    (la tâche en cours n'est jamais déplacée). Avec reauction=True, un taxi qui devient libre relance aussi une
+    enchère, et chaque enchère remet en jeu toutes les tâches qui ne sont pas encore commencées.
+    """
+
+    # Priorité à date égale : les taxis arrivent, puis les tâches, puis l'enchère voit l'état à jour
+    PICKUP, DROPOFF, ARRIVAL, AUCTION = "pickup", "dropoff", "arrival", "auction"
+    PRIORITIES = {PICKUP: 0, DROPOFF: 0, ARRIVAL: 1, AUCTION: 2}
+
+    def __init__(self, env, allocation_method=0, ordonancement_method=0, local_search=False, observers=(),
+                 speed=1.0, horizon=None, reauction=False):
+        super().__init__(env, allocation_method, ordonancement_method, local_search, observers)
+        self.speed = speed  # Distance parcourue par unité de temps
+        self.horizon = env.num_iterations if horizon is None else horizon  # Pas d'arrivée à partir de cette date
+        self.reauction = reauction
+        self.events = []  # Tas de (date, priorité, numéro, type, taxi)
+        self._sequence = itertools.count()
+        self.legs = {}  # Indice du taxi -> (type, date) du trajet en cours
+        self._auction_time = None  # Date de l'enchère déjà prévue, pour n'en lancer qu'une par date
+        self.completed_tasks = {taxi.taxi_id: [] for taxi in env.taxis}  # Tâches livrées, retirées des plans
+        self.distance = 0.0  # Distance parcourue par la flotte
+
+    def schedule(self, date, event, taxi_id=None):
+        heapq.heappush(self.events, (date, self.PRIORITIES[event], next(self._sequence), event, taxi_id))
+
+    def schedule_auction(self, date):
+        if self._auction_time != date:
+            self._auction_time = date
+            self.schedule(date, self.AUCTION)
+
+    def dispatch(self, taxi):
+        """Lancer un taxi libre vers le départ de sa tâche en cours, ou directement vers sa destination s'il y est."""
+        if taxi.taxi_id in self.legs or taxi.current_task_index >= len(taxi.tasks):
+            return
+        task = taxi.tasks[taxi.current_task_index]
+        if taxi.position != task.start:
+            event, distance = self.PICKUP, self.env.calculate_distance(taxi.position, task.start)
+        else:
+            event, distance = self.DROPOFF, task.cost
+        date = self.env.time + distance / self.speed
+        self.legs[taxi.taxi_id] = (event, date)
+        self.schedule(date, event, taxi.taxi_id)
+
+    def _committed(self, taxi):
+        """Tâche en cours (les tâches terminées sont archivées) : le début du plan qu'une enchère ne peut plus
+        modifier."""
+        return taxi.tasks[:taxi.current_task_index + (taxi.taxi_id in self.legs)]
+
+    def auction(self):
+        """Allouer les tâches en attente, puis réordonnancer la suite du plan des taxis qui en ont reçu."""
+        env = self.env
+        committed = [self._committed(taxi) for taxi in env.taxis]
+        before = [len(taxi.tasks) for taxi in env.taxis]
+        if self.reauction:
+            # Les tâches non commencées retournent dans le lot de l'enchère
+            for taxi, prefix in zip(env.taxis, committed):
+                env.tasks.extend(taxi.tasks[len(prefix):])
+                env.replace_plan_tail(taxi, len(prefix), [])
+
+        allocation_start = time.perf_counter()
+        allocated = len(env.tasks)
+        if env.tasks:
+            env.allocate_tasks(allocation_method=self.allocation_method)
+        allocated -= len(env.tasks)
+        ordering_start = time.perf_counter()
+
+        order = self.ordering_function()
+        for taxi, prefix, size in zip(env.taxis, committed, before):
+            if len(taxi.tasks) == size and not self.reauction:
+                continue
+            # Certaines allocations (Opti) réordonnent tout le plan : le début engagé est remis en tête
+            kept = {id(task) for task in prefix}
+            remaining = [task for task in taxi.tasks if id(task) not in kept]
+            start = prefix[-1].end if len(prefix) > taxi.current_task_index else taxi.position
+            cost = sum(task.cost for task in remaining)
+            if order is not None:
+                remaining, cost = order(remaining, start)
+            if self.local_search:
+                remaining, cost = env.improve_task_order(remaining, start)
+            if taxi.tasks[:len(prefix)] == prefix:
+                env.replace_plan_tail(taxi, len(prefix), remaining)
+            else:
+                taxi.tasks = list(prefix) + list(remaining)
+            taxi.total_cost = cost  # Coût de la suite du plan, depuis la fin du trajet en cours
+            self.dispatch(taxi)
+        return allocated, ordering_start - allocation_start, time.perf_counter() - ordering_start
+
+    def start(self):
+        """Prévoir la première arrivée, et une enchère immédiate s'il y a déjà des tâches en attente."""
+        if self.horizon > self.env.time:
+            self.schedule(self.env.time, self.ARRIVAL)
+        if self.env.tasks:
+            self.schedule_auction(self.env.time)
+        for taxi in self.env.taxis:
+            self.dispatch(taxi)
+        self.start_metrics = {"allocation_time": 0.0, "ordering_time": 0.0}
+        self.started = True
+        self._notify("on_start")
+
+    def step(self):
+        """Traiter l'événement suivant (l'horloge saute à sa date) et renvoyer les mesures de cet événement."""
+        env = self.env
+        step_start = time.perf_counter()
+        date, _, _, event, taxi_id = heapq.heappop(self.events)
+        env.time = date
+
+        generated = allocated = moves = 0
+        generation_time = allocation_time = ordering_time = execution_time = render_time = 0.0
+        if event == self.ARRIVAL:
+            pending = len(env.tasks)
+            env.generate_tasks()
+            generated = len(env.tasks) - pending
+            generation_time = time.perf_counter() - step_start
+            if date + env.task_frequency < self.horizon:
+                self.schedule(date + env.task_frequency, self.ARRIVAL)
+            self.schedule_auction(date)
+        elif event == self.AUCTION:
+            self._auction_time = None
+            allocated, allocation_time, ordering_time = self.auction()
+        else:
+            # Le taxi atteint le départ (PICKUP) ou la destination (DROPOFF) de sa tâche en cours
+            execution_start = time.perf_counter()
+            taxi = env.taxis[taxi_id]
+            del self.legs[taxi_id]
+            position = taxi.position
+            taxi.execute_task()
+            self.distance += env.calculate_distance(position, taxi.position)
+            if event == self.DROPOFF:
+                self.completed_tasks[taxi_id].extend(taxi.archive_completed())
+            taxi.update_trajectories(date)
+            moves = 1
+            execution_time = time.perf_counter() - execution_start
+
+            render_start = time.perf_counter()
+            self._notify("render")
+            render_time = time.perf_counter() - render_start
+            if taxi.current_task_index >= len(taxi.tasks):
+                # Supprimer les lignes terminées après affichage
+                taxi.reset_finished_trajectory()
+                if env.tasks or (self.reauction and self._queued()):
+                    self.schedule_auction(date)
+            self.dispatch(taxi)
+
+        self.time_step += 1
+        return {
+            "time": env.time,
+            "event": event,
+            "taxi_id": taxi_id,
+            "generated": generated,
+            "allocated": allocated,
+            "pending": len(env.tasks),
+            "moves": moves,
+            "completed": env.fleet.completed(),
+            "total_cost": env.fleet.total_cost(),
+            "distance": self.distance,
+            "generation_time": generation_time,
+            "allocation_time": allocation_time,
+            "ordering_time": ordering_time,
+            "execution_time": execution_time,
+            "render_time": render_time,
+            "step_time": time.perf_counter() - step_start,
+        }
+
+    def _queued(self):
+        """Vrai si un taxi a des tâches allouées qu'il n'a pas encore commencées."""
+        return any(len(taxi.tasks) > len(self._committed(taxi)) for taxi in self.env.taxis)
+
+    def run(self, until=None):
+        """Traiter les événements jusqu'à la date until (par défaut jusqu'à épuisement : toutes les tâches arrivées
+        avant l'horizon sont livrées) et renvoyer la liste des mesures par événement."""
+        if not self.started:
+            self.start()
+
+        history = []
+        while self.running and self.events and (until is None or self.events[0][0] <= until):
+            self._notify("before_step")
+            if not self.running:
+                break
+            metrics = self.step()
+            history.append(metrics)
+            self._notify("after_step", metrics)
+
+        if until is not None and self.running:
+            self.env.time = max(self.env.time, until)
+        self._notify("on_end")
+        self.env.close()
+        return history
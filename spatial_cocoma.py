@@ -0,0 +1,111 @@
+import heapq
+import math
+
+
+# -------------------------------
+# Index spatial (grille uniforme)
+# -------------------------------
+class GrilleSpatiale:
+    """Index spatial par grille uniforme : chaque point (x, y) associé à une clé est rangé dans la case de côté cell_size
+    qui le contient.
+
+    Les requêtes du plus proche voisin parcourent les cases par anneaux concentriques autour du point demandé et
+    s'arrêtent dès qu'aucune case plus lointaine ne peut contenir de point plus proche. Les égalités de distance sont
+    départagées par la plus petite clé, ce qui rend les résultats déterministes.
+    """
+
+    def __init__(self, cell_size=1.0):
+        self.cell_size = float(cell_size) if cell_size > 0 else 1.0
+        self.cells = {}   # (cx, cy) -> {clé: point}
+        self.points = {}  # clé -> point
+        self.bounds = None  # Cases extrêmes occupées (cx_min, cy_min, cx_max, cy_max)
+
+    @classmethod
+    def from_points(cls, keys, points, grid_size=None):
+        """Construire un index dont la taille de case vise environ un point par case."""
+        points = list(points)
+        if grid_size is None:
+            coords = [c for point in points for c in point]
+            grid_size = (max(coords) - min(coords) + 1) if coords else 1
+        index = cls(grid_size / math.sqrt(max(len(points), 1)))
+        for key, point in zip(keys, points):
+            index.insert(key, point)
+        return index
+
+    def __len__(self):
+        return len(self.points)
+
+    def __contains__(self, key):
+        return key in self.points
+
+    def _cell(self, point):
+        return (math.floor(point[0] / self.cell_size), math.floor(point[1] / self.cell_size))
+
+    def insert(self, key, point):
+        if key in self.points:
+            self.remove(key)
+        cell = self._cell(point)
+        self.cells.setdefault(cell, {})[key] = point
+        self.points[key] = point
+        if self.bounds is None:
+            self.bounds = (cell[0], cell[1], cell[0], cell[1])
+        else:
+            x0, y0, x1, y1 = self.bounds
+            self.bounds = (min(x0, cell[0]), min(y0, cell[1]), max(x1, cell[0]), max(y1, cell[1]))
+
+    def remove(self, key):
+        point = self.points.pop(key)
+        cell = self._cell(point)
+        bucket = self.cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self.cells[cell]
+
+    def _ring(self, cx, cy, r):
+        """Cases occupées à distance de Tchebychev exactement r de la case (cx, cy)."""
+        if r == 0:
+            candidates = [(cx, cy)]
+        else:
+            candidates = [(cx + dx, cy - r) for dx in range(-r, r + 1)]
+            candidates += [(cx + dx, cy + r) for dx in range(-r, r + 1)]
+            candidates += [(cx - r, cy + dy) for dy in range(-r + 1, r)]
+            candidates += [(cx + r, cy + dy) for dy in range(-r + 1, r)]
+        return [self.cells[cell] for cell in candidates if cell in self.cells]
+
+    def k_nearest(self, point, k=1):
+        """Les k points les plus proches, sous forme de liste [(distance, clé)] triée par (distance, clé)."""
+        if k <= 0 or not self.points:
+            return []
+        k = min(k, len(self.points))
+        x, y = point
+        cx, cy = self._cell(point)
+        x0, y0, x1, y1 = self.bounds
+        max_ring = max(cx - x0, x1 - cx, cy - y0, y1 - cy)
+
+        best = []  # Candidats (distance, clé) rencontrés jusqu'ici
+        visited = 0  # Nombre de cases examinées
+        r = 0
+        while r <= max_ring:
+            if visited > len(self.points):
+                # Les anneaux deviennent plus coûteux qu'un parcours complet des points restants
+                return self._k_nearest_scan(point, k)
+            for bucket in self._ring(cx, cy, r):
+                for key, (px, py) in bucket.items():
+                    best.append((math.hypot(px - x, py - y), key))
+            visited += max(1, 8 * r)
+            if len(best) >= k:
+                best = heapq.nsmallest(k, best)
+                # Tout point d'un anneau au-delà de r est à une distance strictement supérieure à r * cell_size
+                if best[-1][0] <= r * self.cell_size:
+                    return best
+            r += 1
+        return sorted(best)[:k]
+
+    def _k_nearest_scan(self, point, k):
+        x, y = point
+        return heapq.nsmallest(k, ((math.hypot(px - x, py - y), key) for key, (px, py) in self.points.items()))
+
+    def nearest(self, point):
+        """Le point le plus proche : (distance, clé), ou None si l'index est vide."""
+        result = self.k_nearest(point, 1)
+        return result[0] if result else None
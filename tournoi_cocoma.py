@@ -0,0 +1,144 @@
+import argparse
+import contextlib
+import csv
+import itertools
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from modele_cocoma import Environment
+from simulation_cocoma import EventSimulator, Simulator
+
+# Paramètres de l'environnement qu'une grille d'expériences peut faire varier
+PARAMETERS = ("grid_size", "num_taxis", "task_frequency", "task_number", "num_iterations")
+DEFAULTS = {"grid_size": 20, "num_taxis": 3, "task_frequency": 8, "task_number": 9, "num_iterations": 30}
+ALLOCATION_NAMES = {0: "Random", 1: "Opti", 2: "PSI", 3: "SSI", 4: "SSI avec regret", 5: "Hongroise", 6: "DCOP DPOP", 7: "DCOP DSA"}
+ORDONANCEMENT_NAMES = {0: "Greedy", 1: "Opti", 2: "Christofides"}
+
+
+# -------------------------------
+# Cellules du tournoi
+# -------------------------------
+def make_cells(seeds, allocation_methods=(0, 2, 3, 4), ordonancement_methods=(2,), clock="ticks", **parameters):
+    """Produit cartésien (graine × allocation × ordonnancement × paramètres) des expériences à lancer.
+
+    Chaque paramètre de l'environnement (grid_size, num_taxis, ...) reçoit une valeur ou une liste de valeurs ;
+    les paramètres absents prennent les valeurs de DEFAULTS. clock choisit la simulation : "ticks" (pas de temps
+    fixe, Simulator) ou "events" (événements discrets, EventSimulator).
+    """
+    unknown = set(parameters) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Paramètres inconnus : {sorted(unknown)}")
+    values = []
+    for name in PARAMETERS:
+        value = parameters.get(name, DEFAULTS[name])
+        values.append(list(value) if isinstance(value, (list, tuple, range)) else [value])
+
+    cells = []
+    for combination in itertools.product(*values):
+        for seed, allocation, ordonancement in itertools.product(seeds, allocation_methods, ordonancement_methods):
+            cell = dict(zip(PARAMETERS, combination))
+            cell.update(seed=seed, allocation_method=allocation, ordonancement_method=ordonancement, clock=clock)
+            cells.append(cell)
+    return cells
+
+
+def run_cell(cell, quiet=True):
+    """Reconstruire l'environnement d'une cellule à partir de sa graine, le simuler et renvoyer la ligne de résultats.
+
+    Le coût est celui de l'allocation (calculate_allocation_cost) avec le pas de temps fixe, et la distance
+    parcourue par la flotte avec les événements discrets, où toutes les tâches sont livrées en fin de simulation.
+    """
+    with contextlib.ExitStack() as stack:
+        if quiet:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        env = Environment(**{name: cell[name] for name in PARAMETERS}, random_seed=cell["seed"])
+        events = cell.get("clock") == "events"
+        simulator = (EventSimulator if events else Simulator)(env, allocation_method=cell["allocation_method"],
+                                                              ordonancement_method=cell["ordonancement_method"])
+        start = time.perf_counter()
+        history = simulator.run()
+        wall_time = time.perf_counter() - start
+
+    row = dict(cell)
+    row.update(
+        cost=simulator.distance if events else env.calculate_allocation_cost(),
+        total_cost=env.fleet.total_cost(),
+        completed=env.fleet.completed(),
+        pending=len(env.tasks),
+        wall_time=wall_time,
+        generation_time=sum(metrics["generation_time"] for metrics in history),
+        allocation_time=simulator.start_metrics["allocation_time"] + sum(metrics["allocation_time"] for metrics in history),
+        ordering_time=simulator.start_metrics["ordering_time"] + sum(metrics.get("ordering_time", 0) for metrics in history),
+        execution_time=sum(metrics["execution_time"] for metrics in history),
+    )
+    return row
+
+
+# -------------------------------
+# Exécution parallèle
+# -------------------------------
+def run_tournament(cells, max_workers=None, chunksize=None):
+    """Exécuter les cellules sur un pool de processus (max_workers=1 pour une exécution séquentielle).
+
+    Les lignes de résultats sont renvoyées dans l'ordre des cellules.
+    """
+    if max_workers == 1:
+        return [run_cell(cell) for cell in cells]
+    workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        # Quelques lots par processus : assez pour équilibrer la charge sans multiplier les échanges
+        chunksize = max(1, len(cells) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_cell, cells, chunksize=chunksize))
+
+
+def summarize(rows, keys=("allocation_method", "ordonancement_method"), columns=("cost", "wall_time")):
+    """Moyenne des colonnes demandées par groupe de cellules partageant les mêmes clés."""
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row[key] for key in keys), []).append(row)
+    return {
+        group: {column: statistics.fmean(row[column] for row in group_rows) for column in columns}
+        for group, group_rows in sorted(groups.items())
+    }
+
+
+def write_csv(rows, path):
+    """Enregistrer la table des résultats au format CSV."""
+    if not rows:
+        return
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# -------------------------------
+# Main Program
+# -------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tournoi Monte-Carlo des méthodes d'allocation et d'ordonnancement.")
+    parser.add_argument("--seeds", type=int, default=100, help="nombre de graines (0 .. seeds-1)")
+    parser.add_argument("--allocation", type=int, nargs="+", default=[0, 2, 3, 4])
+    parser.add_argument("--ordonancement", type=int, nargs="+", default=[2])
+    for name in PARAMETERS:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, nargs="+", default=[DEFAULTS[name]])
+    parser.add_argument("--clock", choices=("ticks", "events"), default="ticks",
+                        help="pas de temps fixe ou simulation à événements discrets (défaut : %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="nombre de processus (tous les cœurs par défaut)")
+    parser.add_argument("--output", help="fichier CSV des résultats")
+    args = parser.parse_args()
+
+    cells = make_cells(range(args.seeds), args.allocation, args.ordonancement, args.clock,
+                       **{name: getattr(args, name) for name in PARAMETERS})
+    start = time.perf_counter()
+    rows = run_tournament(cells, max_workers=args.workers)
+    print(f"{len(rows)} simulations en {time.perf_counter() - start:.2f} s")
+
+    if args.output:
+        write_csv(rows, args.output)
+    for (allocation, ordonancement), means in summarize(rows).items():
+        print(f"{ALLOCATION_NAMES.get(allocation, allocation):<16} {ORDONANCEMENT_NAMES.get(ordonancement, ordonancement):<13}"
+              f" cost = {means['cost']:8.2f}   time = {means['wall_time'] * 1000:7.2f} ms")
@@ -0,0 +1,65 @@
+import csv
+from collections import deque
+
+# Nombre de segments conservés en mémoire par défaut pour chaque historique de trajectoire
+DEFAULT_CAPACITY = 1024
+
+
+def ring_buffer(capacity=DEFAULT_CAPACITY):
+    """Historique de segments de capacité fixe : au-delà, les segments les plus anciens sont oubliés.
+
+    capacity=None conserve tout l'historique (comportement d'origine, mémoire non bornée).
+    """
+    return deque(maxlen=capacity)
+
+
+# -------------------------------
+# Journal des trajectoires sur disque
+# -------------------------------
+class TrajectoryLog:
+    """Journal CSV (time, taxi_id, x0, y0, x1, y1) des segments parcourus par les taxis.
+
+    Les lignes sont mises en mémoire tampon par le fichier ; close() les écrit sur le disque, et une écriture
+    ultérieure rouvre le fichier en ajout.
+    """
+
+    FIELDS = ("time", "taxi_id", "x0", "y0", "x1", "y1")
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.writer = None
+        with open(path, "w", newline="") as f:
+            csv.writer(f).writerow(self.FIELDS)
+
+    def write(self, time, taxi_id, segments):
+        """Ajouter au journal les segments ((x0, y0), (x1, y1)) parcourus par un taxi au temps time."""
+        if not segments:
+            return
+        if self.file is None:
+            self.file = open(self.path, "a", newline="")
+            self.writer = csv.writer(self.file)
+        self.writer.writerows((time, taxi_id, *start, *end) for start, end in segments)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.writer = None
+
+
+def _coordinate(value):
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def read_trajectory_log(path):
+    """Relire un journal : dictionnaire taxi_id -> liste de (time, (x0, y0), (x1, y1))."""
+    trajectories = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            x0, y0, x1, y1 = (_coordinate(row[field]) for field in ("x0", "y0", "x1", "y1"))
+            time = _coordinate(row["time"]) if row["time"] else None
+            segment = (time, (x0, y0), (x1, y1))
+            trajectories.setdefault(int(row["taxi_id"]), []).append(segment)
+    return trajectories
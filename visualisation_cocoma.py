@@ -0,0 +1,127 @@
+import sys
+import time
+import pygame
+from simulation_cocoma import EventSimulator, Simulator, Observer
+
+# -------------------------------
+# Visualisation avec Pygame
+# -------------------------------
+class PygameViewer(Observer):
+    """Affichage pygame de la simulation, en pas à pas (touche Entrée) ou en continu avec un délai."""
+
+    def __init__(self, screen_size=600, step_by_step=True, delay=0.5):
+        self.screen_size = screen_size
+        self.step_by_step = step_by_step
+        self.delay = delay  # Délai (s) entre deux pas en mode continu
+
+    def on_start(self, simulator):
+        pygame.init()
+
+        # Configuration de l'affichage
+        self.screen = pygame.display.set_mode((self.screen_size, self.screen_size))
+        pygame.display.set_caption("Taxi Task Allocation Simulation")
+        self.clock = pygame.time.Clock()
+        self.cell_size = self.screen_size // simulator.env.grid_size
+
+    def before_step(self, simulator):
+        if not self.step_by_step:
+            # En mode continu, ralentir selon le délai
+            time.sleep(self.delay)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    simulator.running = False
+            return
+
+        # Si la touche "Entrée" est pressée, avancer le temps
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    simulator.running = False
+                    return
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+                    return
+            self.clock.tick(30)
+
+    def draw_line(self, start, end, color):
+        cell_size = self.cell_size
+        pygame.draw.line(
+            self.screen, color,
+            (start[1] * cell_size + cell_size // 2, start[0] * cell_size + cell_size // 2),  # Colonne -> x, Ligne -> y
+            (end[1] * cell_size + cell_size // 2, end[0] * cell_size + cell_size // 2),      # Colonne -> x, Ligne -> y
+            3
+        )
+
+    def draw_grid(self, grid_size):
+        """Dessiner la grille avec les indices des cases sur les bords."""
+        screen, cell_size, screen_size = self.screen, self.cell_size, self.screen_size
+        font = pygame.font.SysFont("Arial", 12)
+
+        for x in range(grid_size):
+            for y in range(grid_size):
+                # Dessiner les lignes de la grille
+                pygame.draw.line(screen, (0, 0, 0), (x * cell_size, 0), (x * cell_size, screen_size))
+                pygame.draw.line(screen, (0, 0, 0), (0, y * cell_size), (screen_size, y * cell_size))
+
+        # Numéros sur le bord supérieur et inférieur (axe X)
+        for x in range(grid_size):
+            text = font.render(f"{x}", True, (0, 0, 0))
+            screen.blit(text, (x * cell_size + cell_size // 2 - text.get_width() // 2, 0))
+            screen.blit(text, (x * cell_size + cell_size // 2 - text.get_width() // 2, screen_size - text.get_height()))
+
+        # Numéros sur le bord gauche et droit (axe Y)
+        for y in range(grid_size):
+            text = font.render(f"{y}", True, (0, 0, 0))
+            screen.blit(text, (0, y * cell_size + cell_size // 2 - text.get_height() // 2))
+            screen.blit(text, (screen_size - text.get_width(), y * cell_size + cell_size // 2 - text.get_height() // 2))
+
+    def render(self, simulator):
+        env = simulator.env
+        screen, cell_size = self.screen, self.cell_size
+
+        # Dessiner l'environnement
+        screen.fill((255, 255, 255))
+        self.draw_grid(env.grid_size)  # Dessiner la grille avec les indices des cases
+
+        font = pygame.font.SysFont("Arial", 14)
+        for taxi in env.taxis:
+            # Dessiner les trajectoires finies
+            for line in taxi.finished_trajectory:
+                self.draw_line(line[0], line[1], taxi.color)
+
+            # Dessiner les trajectoires récentes
+            for line in taxi.recent_trajectory:
+                self.draw_line(line[0], line[1], (0, 0, 0))  # Couleur noire pour différencier
+
+            # Dessiner la position actuelle
+            pygame.draw.circle(
+                screen, taxi.color,
+                (taxi.position[1] * cell_size + cell_size // 2,
+                taxi.position[0] * cell_size + cell_size // 2),
+                10
+            )
+
+            # Afficher le numéro du taxi
+            text = font.render(f"Taxi {taxi.taxi_id}", True, (0, 0, 0))
+            screen.blit(
+                text,
+                (taxi.position[1] * cell_size + cell_size // 2 - text.get_width() // 2,
+                taxi.position[0] * cell_size + cell_size // 2 - 20)
+            )
+
+        pygame.display.flip()
+
+    def after_step(self, simulator, metrics):
+        print(f"Time {simulator.env.time}")
+
+    def on_end(self, simulator):
+        pygame.quit()
+
+
+def visualize_with_pygame(env, allocation_method=0, heuristic_method=0, ordonancement_method=0, local_search=False,
+                          clock="ticks"):
+    # clock="events" : simulation à événements discrets, un affichage par arrivée au départ ou à la destination
+    simulator_class = EventSimulator if clock == "events" else Simulator
+    simulator = simulator_class(env, allocation_method=allocation_method, ordonancement_method=ordonancement_method,
+                                local_search=local_search, observers=[PygameViewer()])
+    simulator.run()
+    sys.exit()